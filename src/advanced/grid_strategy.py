@@ -4,11 +4,14 @@ Automated buy-low/sell-high within a price range
 Places multiple buy and sell limit orders at different price levels
 """
 import sys
-import time
-from typing import Dict, Any, Optional, List, Tuple
+import argparse
+import bisect
+import threading
+from decimal import Decimal, ROUND_CEILING
+from typing import Dict, Any, Optional, List, Set, Tuple
 from base_bot import BasicBot
-from utils import BotLogger, Formatter
-from binance.exceptions import BinanceAPIException
+from config import Config
+from utils import BotLogger, Formatter, canon
 
 class GridBot(BasicBot):
     """Bot for executing grid trading strategy on Binance Futures"""
@@ -16,6 +19,139 @@ class GridBot(BasicBot):
     def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, testnet: bool = True):
         super().__init__(api_key, api_secret, testnet)
         self.logger = BotLogger('GridTrading')
+        self._stop_event = threading.Event()
+        self._fill_event = threading.Event()  # set by the user data stream when a grid order fills
+        self._grid_ticks_cache: List[int] = []
+        self._open_orders: Dict[int, Dict[str, str]] = {}  # orderId -> {'side', 'price'}
+        self._closed_order_ids: Set[int] = set()  # closed on the stream before placement returned
+        self._orders_lock = threading.Lock()
+        self._monitor_symbol: Optional[str] = None
+    
+    def stop_monitoring(self):
+        """Stop a running monitor_and_rebalance_grid loop (wakes it immediately)"""
+        self._stop_event.set()
+        self._fill_event.set()
+    
+    def _on_user_event(self, msg: Dict[str, Any]) -> None:
+        """
+        Keep the local open-order book in sync from ORDER_TRADE_UPDATE events
+        
+        Orders enter the book when placement returns (_place_grid_orders), so
+        events only update or remove entries. An order that closes before its
+        placement has been recorded is remembered so it is not added afterwards.
+        """
+        if msg.get('e') != 'ORDER_TRADE_UPDATE':
+            return
+        order = msg.get('o', {})
+        if order.get('s') != self._monitor_symbol:
+            return
+        
+        status = order.get('X')
+        order_id = order['i']
+        with self._orders_lock:
+            if status in ('NEW', 'PARTIALLY_FILLED'):
+                if order_id in self._open_orders:
+                    self._open_orders[order_id] = {'side': order['S'], 'price': order['p']}
+            elif status in ('FILLED', 'CANCELED', 'EXPIRED', 'REJECTED'):
+                if self._open_orders.pop(order_id, None) is None:
+                    self._closed_order_ids.add(order_id)
+        if status == 'FILLED':
+            self._fill_event.set()
+    
+    def _seed_open_orders(self, symbol: str) -> None:
+        """Load the current open orders over REST into the local order book"""
+        orders = self.get_open_orders(symbol)
+        with self._orders_lock:
+            self._open_orders = {o['orderId']: {'side': o['side'], 'price': o['price']} for o in orders}
+            self._closed_order_ids.clear()
+    
+    @staticmethod
+    def _to_ticks(price: Any, tick_size: Decimal) -> int:
+        """Convert a price to the nearest whole number of ticks"""
+        return int(round(Decimal(str(price)) / tick_size))
+    
+    @staticmethod
+    def _grid_ticks(lower_price: float, upper_price: float, grid_levels: int,
+                    tick_size: Decimal) -> List[int]:
+        """Evenly spaced grid levels between lower and upper bounds, in integer ticks"""
+        ticks_lower = GridBot._to_ticks(lower_price, tick_size)
+        span = GridBot._to_ticks(upper_price, tick_size) - ticks_lower
+        steps = grid_levels - 1
+        # Integer round-half-up of ticks_lower + i * span / steps
+        return [ticks_lower + (2 * i * span + steps) // (2 * steps) for i in range(grid_levels)]
+    
+    def _filter_grid_ticks(self, symbol: str, ticks: List[int], tick_size: Decimal,
+                           quantity: float) -> List[int]:
+        """
+        Drop grid levels that would fail the symbol's exchange filters
+        
+        Levels are whole ticks, so they are always tick-aligned; only the
+        minimum notional needs checking, which reduces to a lowest valid tick.
+        Rejected levels are logged in a single summary line.
+        
+        Returns:
+            Ticks that pass the filters, in their original order
+        """
+        min_notional = self.get_symbol_filters(symbol)['min_notional']
+        min_tick = (min_notional / (tick_size * Decimal(str(quantity)))).to_integral_value(rounding=ROUND_CEILING)
+        valid = [t for t in ticks if t >= min_tick]
+        if len(valid) != len(ticks):
+            rejected = [f"{t * tick_size:f}" for t in ticks if t < min_tick]
+            self.logger.warning("Skipping %s grid levels below min notional %s: %s",
+                                len(rejected), min_notional, ', '.join(rejected))
+        return valid
+    
+    def _place_grid_orders(self, symbol: str, buy_ticks: List[int], sell_ticks: List[int],
+                           tick_size: Decimal, quantity: float,
+                           position_side: str = 'BOTH') -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Place LIMIT orders for both sides of the grid in one batch dispatch
+        
+        Buy and sell levels go out together, so their batch requests are in
+        flight concurrently instead of the sell side waiting on the buy side.
+        
+        Returns:
+            Tuple of (buy_orders, sell_orders) that were placed successfully
+        """
+        # Every level shares the same params except the side and price
+        template = {
+            'symbol': symbol,
+            'type': 'LIMIT',
+            'quantity': quantity,
+            'timeInForce': 'GTC',
+            'positionSide': position_side
+        }
+        levels = [('BUY', f"{t * tick_size:f}") for t in buy_ticks]
+        levels += [('SELL', f"{t * tick_size:f}") for t in sell_ticks]
+        orders = [dict(template, side=side, price=price) for side, price in levels]
+        
+        placed = {'BUY': [], 'SELL': []}
+        placed_prices = {'BUY': [], 'SELL': []}
+        failures = {'BUY': [], 'SELL': []}
+        results = self.place_batch_orders(orders)
+        with self._orders_lock:
+            for (side, price), result in zip(levels, results):
+                if 'code' in result:
+                    failures[side].append(f"{price} ({result.get('msg')})")
+                    continue
+                placed[side].append(result)
+                placed_prices[side].append(price)
+                # Record the level as occupied right away, so a fill wake-up that
+                # runs before the NEW event arrives does not place it again
+                order_id = result['orderId']
+                if order_id in self._closed_order_ids:
+                    self._closed_order_ids.discard(order_id)
+                else:
+                    self._open_orders[order_id] = {'side': side, 'price': price}
+        
+        # One summary line per side rather than a log call per level
+        for side in ('BUY', 'SELL'):
+            if placed_prices[side]:
+                self.logger.info("Grid %s orders placed at %s", side, ', '.join(placed_prices[side]))
+            if failures[side]:
+                self.logger.warning("Failed to place %s %s orders: %s",
+                                    len(failures[side]), side, '; '.join(failures[side]))
+        return placed['BUY'], placed['SELL']
     
     def create_grid_orders(self, symbol: str, lower_price: float, upper_price: float,
                           grid_levels: int, quantity_per_grid: float,
@@ -44,8 +180,11 @@ class GridBot(BasicBot):
         if not self.validate_order_params(symbol, 'BUY', quantity_per_grid, lower_price):
             raise ValueError("Invalid order parameters")
         
-        symbol = symbol.upper()
-        position_side = position_side.upper()
+        if not self.validate_against_filters(symbol, quantity_per_grid):
+            raise ValueError("Quantity does not satisfy the symbol's exchange filters")
+        
+        symbol = canon(symbol)
+        position_side = canon(position_side)
         
         # Calculate grid parameters
         price_range = upper_price - lower_price
@@ -53,55 +192,23 @@ class GridBot(BasicBot):
         
         current_price = self.get_current_price(symbol)
         
-        self.logger.info(f"Creating grid for {symbol}")
-        self.logger.info(f"Price range: {lower_price} - {upper_price}")
-        self.logger.info(f"Grid levels: {grid_levels}, Step: {grid_step:.2f}")
-        self.logger.info(f"Current price: {current_price}")
-        
-        buy_orders = []
-        sell_orders = []
+        self.logger.info("Creating grid for %s", symbol)
+        self.logger.info("Price range: %s - %s", lower_price, upper_price)
+        self.logger.info("Grid levels: %s, Step: %.2f", grid_levels, grid_step)
+        self.logger.info("Current price: %s", current_price)
         
         try:
-            # Create buy and sell orders at each grid level
-            for i in range(grid_levels):
-                grid_price = lower_price + (i * grid_step)
-                grid_price = round(grid_price, 2)
-                
-                # Place buy orders below current price
-                if grid_price < current_price:
-                    try:
-                        buy_order = self.client.futures_create_order(
-                            symbol=symbol,
-                            side='BUY',
-                            type='LIMIT',
-                            quantity=quantity_per_grid,
-                            price=grid_price,
-                            timeInForce='GTC',
-                            positionSide=position_side
-                        )
-                        buy_orders.append(buy_order)
-                        self.logger.info(f"Grid BUY order placed at {grid_price}")
-                        time.sleep(0.1)  # Rate limiting
-                    except BinanceAPIException as e:
-                        self.logger.warning(f"Failed to place BUY order at {grid_price}: {e.message}")
-                
-                # Place sell orders above current price
-                elif grid_price > current_price:
-                    try:
-                        sell_order = self.client.futures_create_order(
-                            symbol=symbol,
-                            side='SELL',
-                            type='LIMIT',
-                            quantity=quantity_per_grid,
-                            price=grid_price,
-                            timeInForce='GTC',
-                            positionSide=position_side
-                        )
-                        sell_orders.append(sell_order)
-                        self.logger.info(f"Grid SELL order placed at {grid_price}")
-                        time.sleep(0.1)  # Rate limiting
-                    except BinanceAPIException as e:
-                        self.logger.warning(f"Failed to place SELL order at {grid_price}: {e.message}")
+            # Split grid levels (in integer ticks) around the current price
+            tick_size = self.get_tick_size(symbol)
+            current_ticks = Decimal(str(current_price)) / tick_size
+            grid_ticks = self._grid_ticks(lower_price, upper_price, grid_levels, tick_size)
+            grid_ticks = self._filter_grid_ticks(symbol, grid_ticks, tick_size, quantity_per_grid)
+            buy_ticks = [t for t in grid_ticks if t < current_ticks]
+            sell_ticks = [t for t in grid_ticks if t > current_ticks]
+            
+            buy_orders, sell_orders = self._place_grid_orders(
+                symbol, buy_ticks, sell_ticks, tick_size, quantity_per_grid, position_side
+            )
             
             # Log summary
             self.logger.log_order('GRID', {
@@ -114,13 +221,12 @@ class GridBot(BasicBot):
                 'quantityPerGrid': quantity_per_grid
             })
             
-            self.logger.info(f"Grid created: {len(buy_orders)} BUY orders, {len(sell_orders)} SELL orders")
+            self.logger.info("Grid created: %s BUY orders, %s SELL orders", len(buy_orders), len(sell_orders))
             
             return buy_orders, sell_orders
             
         except Exception as e:
-            error_msg = f"Error creating grid orders: {str(e)}"
-            self.logger.error(error_msg)
+            self.logger.error("Error creating grid orders: %s", e)
             self.logger.log_error_trace(e)
             raise
     
@@ -136,91 +242,98 @@ class GridBot(BasicBot):
             upper_price: Upper bound of price range
             grid_levels: Number of grid levels
             quantity_per_grid: Quantity for each grid order
-            check_interval: Seconds between checks
+            check_interval: Maximum seconds to wait for a fill before an idle check
             max_iterations: Maximum monitoring iterations
         """
-        symbol = symbol.upper()
+        symbol = canon(symbol)
         iteration = 0
+        self._stop_event.clear()
+        self._fill_event.clear()
+        
+        # Grid levels are fixed for the whole monitoring session
+        tick_size = self.get_tick_size(symbol)
+        grid_ticks = self._grid_ticks(lower_price, upper_price, grid_levels, tick_size)
+        self._grid_ticks_cache = sorted(self._filter_grid_ticks(symbol, grid_ticks, tick_size, quantity_per_grid))
+        
+        self.logger.info("Starting grid monitoring for %s", symbol)
+        
+        # Stream prices instead of polling the ticker every iteration
+        try:
+            self.start_price_stream(symbol)
+        except Exception as e:
+            self.logger.warning("Price stream unavailable (%s), polling ticker instead", e)
         
-        self.logger.info(f"Starting grid monitoring for {symbol}")
+        # Track open orders from the user data stream; REST is only used once to
+        # seed the local book (or every iteration if the stream is unavailable)
+        self._monitor_symbol = symbol
+        try:
+            self.start_user_stream(self._on_user_event)
+            use_order_stream = True
+        except Exception as e:
+            self.logger.warning("User data stream unavailable (%s), polling open orders instead", e)
+            use_order_stream = False
+        self._seed_open_orders(symbol)
         
         try:
-            while iteration < max_iterations:
+            while iteration < max_iterations and not self._stop_event.is_set():
                 iteration += 1
                 
-                # Get current price
-                current_price = self.get_current_price(symbol)
-                
-                # Get open orders
-                open_orders = self.get_open_orders(symbol)
-                open_buy_orders = [o for o in open_orders if o['side'] == 'BUY']
-                open_sell_orders = [o for o in open_orders if o['side'] == 'SELL']
+                if iteration > 1:
+                    # Sleep until a fill needs replacing; idle timeouts only rebalance on
+                    # periodic REST resync ticks (every tick when there is no order stream)
+                    triggered = self._fill_event.wait(check_interval)
+                    if self._stop_event.is_set():
+                        break
+                    resync = not use_order_stream or iteration % Config.GRID_RESYNC_ITERATIONS == 0
+                    if not (triggered or resync):
+                        continue
+                    self._fill_event.clear()
+                    if resync:
+                        self._seed_open_orders(symbol)
                 
-                self.logger.debug(f"Iteration {iteration}: Price={current_price}, Open BUY={len(open_buy_orders)}, Open SELL={len(open_sell_orders)}")
+                # Get current price, falling back to REST until the first stream tick
+                # (a cached quote would be stale at sub-TTL intervals)
+                current_price = self.get_stream_price(symbol)
+                if current_price is None:
+                    current_price = self.get_current_price(symbol, use_cache=check_interval >= Config.PRICE_CACHE_TTL)
                 
-                # Calculate expected grid prices
-                grid_step = (upper_price - lower_price) / (grid_levels - 1)
-                expected_buy_prices = set()
-                expected_sell_prices = set()
+                with self._orders_lock:
+                    open_orders = list(self._open_orders.values())
                 
-                for i in range(grid_levels):
-                    grid_price = round(lower_price + (i * grid_step), 2)
-                    if grid_price < current_price:
-                        expected_buy_prices.add(grid_price)
-                    elif grid_price > current_price:
-                        expected_sell_prices.add(grid_price)
+                # Bucket open order levels by side in a single pass
+                open_buy_ticks = set()
+                open_sell_ticks = set()
+                for o in open_orders:
+                    ticks = open_buy_ticks if o['side'] == 'BUY' else open_sell_ticks
+                    ticks.add(self._to_ticks(o['price'], tick_size))
                 
-                # Check for missing buy orders
-                open_buy_prices = {round(float(o['price']), 2) for o in open_buy_orders}
-                missing_buy_prices = expected_buy_prices - open_buy_prices
+                self.logger.debug("Iteration %d: Price=%s, Open BUY=%d, Open SELL=%d",
+                                  iteration, current_price, len(open_buy_ticks), len(open_sell_ticks))
                 
-                for price in missing_buy_prices:
-                    try:
-                        order = self.client.futures_create_order(
-                            symbol=symbol,
-                            side='BUY',
-                            type='LIMIT',
-                            quantity=quantity_per_grid,
-                            price=price,
-                            timeInForce='GTC',
-                            positionSide='BOTH'
-                        )
-                        self.logger.info(f"Replaced BUY grid order at {price}")
-                        time.sleep(0.1)
-                    except BinanceAPIException as e:
-                        self.logger.warning(f"Failed to replace BUY order at {price}: {e.message}")
+                # Split the precomputed (sorted) grid around the current price;
+                # a level equal to the current price gets no order
+                grid = self._grid_ticks_cache
+                current_ticks = Decimal(str(current_price)) / tick_size
+                expected_buy_ticks = frozenset(grid[:bisect.bisect_left(grid, current_ticks)])
+                expected_sell_ticks = frozenset(grid[bisect.bisect_right(grid, current_ticks):])
                 
-                # Check for missing sell orders
-                open_sell_prices = {round(float(o['price']), 2) for o in open_sell_orders}
-                missing_sell_prices = expected_sell_prices - open_sell_prices
-                
-                for price in missing_sell_prices:
-                    try:
-                        order = self.client.futures_create_order(
-                            symbol=symbol,
-                            side='SELL',
-                            type='LIMIT',
-                            quantity=quantity_per_grid,
-                            price=price,
-                            timeInForce='GTC',
-                            positionSide='BOTH'
-                        )
-                        self.logger.info(f"Replaced SELL grid order at {price}")
-                        time.sleep(0.1)
-                    except BinanceAPIException as e:
-                        self.logger.warning(f"Failed to replace SELL order at {price}: {e.message}")
-                
-                # Wait before next check
-                time.sleep(check_interval)
+                # Replace missing buy and sell orders together
+                missing_buy_ticks = sorted(expected_buy_ticks - open_buy_ticks)
+                missing_sell_ticks = sorted(expected_sell_ticks - open_sell_ticks)
+                if missing_buy_ticks or missing_sell_ticks:
+                    self._place_grid_orders(symbol, missing_buy_ticks, missing_sell_ticks, tick_size, quantity_per_grid)
             
-            self.logger.info(f"Grid monitoring completed after {max_iterations} iterations")
+            self.logger.info("Grid monitoring completed after %s iterations", iteration)
             
         except KeyboardInterrupt:
             self.logger.info("Grid monitoring stopped by user")
             raise
         except Exception as e:
-            self.logger.error(f"Error during grid monitoring: {str(e)}")
+            self.logger.error("Error during grid monitoring: %s", e)
             raise
+        finally:
+            self.stop_streams()
+            self._monitor_symbol = None
 
 
 def main():
@@ -228,42 +341,36 @@ def main():
     Formatter.print_header("BINANCE FUTURES - GRID TRADING STRATEGY")
     
     # Parse command line arguments
-    if len(sys.argv) < 6:
-        print(f"Usage: python {sys.argv[0]} <SYMBOL> <LOWER_PRICE> <UPPER_PRICE> <GRID_LEVELS> <QUANTITY_PER_GRID> [POSITION_SIDE] [--monitor] [--interval SEC]")
-        print(f"\nExample: python {sys.argv[0]} BTCUSDT 44000 46000 10 0.01")
-        print(f"         (Create 10 grid levels between 44000-46000, 0.01 BTC per grid)")
-        print(f"\nExample: python {sys.argv[0]} ETHUSDT 2900 3100 20 0.1 BOTH --monitor --interval 60")
-        print(f"         (Create 20 grid levels and monitor with 60s interval)")
-        sys.exit(1)
-    
-    symbol = sys.argv[1]
-    
-    try:
-        lower_price = float(sys.argv[2])
-        upper_price = float(sys.argv[3])
-        grid_levels = int(sys.argv[4])
-        quantity_per_grid = float(sys.argv[5])
-    except ValueError:
-        print(f"{Formatter.format_error(ValueError('Invalid parameters. Check prices, grid levels, and quantity'))}")
-        sys.exit(1)
-    
-    position_side = 'BOTH'
-    monitor = False
-    check_interval = 30
+    parser = argparse.ArgumentParser(
+        description="Create grid trading orders between two prices",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            f"Example: python {sys.argv[0]} BTCUSDT 44000 46000 10 0.01\n"
+            f"         (Create 10 grid levels between 44000-46000, 0.01 BTC per grid)\n"
+            f"\nExample: python {sys.argv[0]} ETHUSDT 2900 3100 20 0.1 BOTH --monitor --interval 60\n"
+            f"         (Create 20 grid levels and monitor with 60s interval)"
+        )
+    )
+    parser.add_argument('symbol', help="Trading pair symbol (e.g., BTCUSDT)")
+    parser.add_argument('lower_price', type=float, help="Lower bound of the price range")
+    parser.add_argument('upper_price', type=float, help="Upper bound of the price range")
+    parser.add_argument('grid_levels', type=int, help="Number of grid levels")
+    parser.add_argument('quantity_per_grid', type=float, help="Quantity for each grid order")
+    parser.add_argument('position_side', nargs='?', type=str.upper, default='BOTH',
+                        choices=['BOTH', 'LONG', 'SHORT'], metavar='POSITION_SIDE',
+                        help="Position side: BOTH, LONG or SHORT (default: BOTH)")
+    parser.add_argument('--monitor', action='store_true', help="Monitor and replace filled grid orders")
+    parser.add_argument('--interval', type=int, default=30, help="Monitor check interval in seconds (default: 30)")
+    args = parser.parse_args()
     
-    i = 6
-    while i < len(sys.argv):
-        if sys.argv[i].upper() in ['BOTH', 'LONG', 'SHORT']:
-            position_side = sys.argv[i]
-        elif sys.argv[i] == '--monitor':
-            monitor = True
-        elif sys.argv[i] == '--interval' and i + 1 < len(sys.argv):
-            try:
-                check_interval = int(sys.argv[i + 1])
-                i += 1
-            except ValueError:
-                pass
-        i += 1
+    symbol = args.symbol
+    lower_price = args.lower_price
+    upper_price = args.upper_price
+    grid_levels = args.grid_levels
+    quantity_per_grid = args.quantity_per_grid
+    position_side = args.position_side
+    monitor = args.monitor
+    check_interval = args.interval
     
     try:
         # Initialize bot
@@ -5,10 +5,14 @@ Note: Binance Futures doesn't support native OCO orders like Spot trading.
 This implementation simulates OCO by placing both orders and monitoring them.
 """
 import sys
+import argparse
+import math
 import time
-from typing import Dict, Any, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple, List
 from base_bot import BasicBot
-from utils import BotLogger, Formatter
+from utils import BotLogger, Formatter, canon
 from binance.exceptions import BinanceAPIException
 
 class OCOOrderBot(BasicBot):
@@ -44,9 +48,9 @@ class OCOOrderBot(BasicBot):
         if not self.validate_order_params(symbol, side, quantity, take_profit_price):
             raise ValueError("Invalid order parameters")
         
-        symbol = symbol.upper()
-        side = side.upper()
-        position_side = position_side.upper()
+        symbol = canon(symbol)
+        side = canon(side)
+        position_side = canon(position_side)
         
         # Determine the correct order sides for closing position
         # If closing LONG (selling), TP should be SELL limit, SL should be SELL stop
@@ -55,37 +59,60 @@ class OCOOrderBot(BasicBot):
         try:
             current_price = self.get_current_price(symbol)
             
-            self.logger.info(f"Placing OCO orders for {symbol}: TP={take_profit_price}, SL={stop_loss_price}")
+            self.logger.info("Placing OCO orders for %s: TP=%s, SL=%s", symbol, take_profit_price, stop_loss_price)
             
-            # Place Take Profit Limit Order
-            tp_order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side,
-                type='LIMIT',
-                quantity=quantity,
-                price=take_profit_price,
-                timeInForce='GTC',
-                positionSide=position_side,
-                reduceOnly=True  # Only reduce the position
-            )
-            
-            self.logger.info(f"Take Profit order placed. Order ID: {tp_order.get('orderId')}")
+            tp_params = {
+                # Take Profit Limit Order
+                'symbol': symbol,
+                'side': side,
+                'type': 'LIMIT',
+                'quantity': quantity,
+                'price': take_profit_price,
+                'timeInForce': 'GTC',
+                'positionSide': position_side,
+                'reduceOnly': True,  # Only reduce the position
+                'newClientOrderId': self.new_client_order_id()
+            }
+            sl_params = {
+                # Stop Loss Order (STOP_MARKET for guaranteed execution)
+                'symbol': symbol,
+                'side': side,
+                'type': 'STOP_MARKET',
+                'quantity': quantity,
+                'stopPrice': stop_loss_price,
+                'positionSide': position_side,
+                'reduceOnly': True,  # Only reduce the position
+                'newClientOrderId': self.new_client_order_id()
+            }
             
-            # Small delay to avoid rate limiting
-            time.sleep(0.1)
+            # Place both legs in a single batch request so the TP never sits
+            # on the book without its SL
+            try:
+                tp_order, sl_order = self.place_batch_orders([tp_params, sl_params])
+            except Exception as e:
+                # Timeout or dropped connection: the batch may have been accepted
+                tp_order = sl_order = {'code': None, 'msg': str(e), 'status': None, 'batchFailed': True}
+            if tp_order.get('batchFailed') and sl_order.get('batchFailed'):
+                tp_order, sl_order = self._place_legs_after_batch_failure(symbol, tp_order, tp_params, sl_params)
             
-            # Place Stop Loss Order (STOP_MARKET for guaranteed execution)
-            sl_order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side,
-                type='STOP_MARKET',
-                quantity=quantity,
-                stopPrice=stop_loss_price,
-                positionSide=position_side,
-                reduceOnly=True  # Only reduce the position
-            )
+            # Each leg is accepted or rejected independently
+            legs = [('Take Profit', tp_order), ('Stop Loss', sl_order)]
+            failed = [(name, order) for name, order in legs if 'code' in order]
+            if failed:
+                for name, order in failed:
+                    self.logger.error("%s order rejected: %s - %s", name, order.get('code'), order.get('msg'))
+                # Never leave a one-sided reduce-only leg behind: cancel the survivor
+                for name, order in legs:
+                    if 'code' not in order:
+                        try:
+                            self.cancel_order(symbol, order['orderId'])
+                        except Exception as e:
+                            self.logger.error("%s order %s could not be cancelled (%s) - manage it manually",
+                                              name, order['orderId'], e)
+                raise ValueError("OCO placement failed: " + "; ".join(f"{name}: {order.get('msg')}" for name, order in failed))
             
-            self.logger.info(f"Stop Loss order placed. Order ID: {sl_order.get('orderId')}")
+            self.logger.info("Take Profit order placed. Order ID: %s", tp_order.get('orderId'))
+            self.logger.info("Stop Loss order placed. Order ID: %s", sl_order.get('orderId'))
             
             # Log OCO pair
             self.logger.log_order('OCO', {
@@ -103,110 +130,235 @@ class OCOOrderBot(BasicBot):
             return tp_order, sl_order
             
         except BinanceAPIException as e:
-            error_msg = f"Binance API Error: {e.status_code} - {e.message}"
-            self.logger.error(error_msg)
+            self.logger.error("Binance API Error: %s - %s", e.status_code, e.message)
             self.logger.log_error_trace(e)
             raise
         except Exception as e:
-            error_msg = f"Error placing OCO orders: {str(e)}"
-            self.logger.error(error_msg)
+            self.logger.error("Error placing OCO orders: %s", e)
             self.logger.log_error_trace(e)
             raise
     
+    def _place_legs_after_batch_failure(self, symbol: str, error: Dict[str, Any],
+                                        *legs: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Place OCO legs individually after the batch request failed
+        
+        A definite rejection (a 4xx other than -1007 "execution status unknown")
+        means neither leg reached the book, so both are re-sent. Otherwise the
+        batch may have been accepted: each leg is looked up by its client order
+        ID first and only legs the exchange does not know about are re-sent.
+        
+        Returns:
+            Results in leg order; a rejected leg is returned as an error dict
+        """
+        status = error.get('status')
+        if status is not None and 400 <= status < 500 and error.get('code') != -1007:
+            self.logger.warning("Batch order request rejected, placing OCO legs individually")
+            return self._place_legs_concurrently(*legs)
+        
+        self.logger.warning("Batch order outcome unknown (%s), checking OCO legs by client order ID", error.get('msg'))
+        found = []
+        for leg in legs:
+            try:
+                found.append(self.find_order(symbol, leg['newClientOrderId']))
+            except Exception as e:
+                # Outcome still unknown: report the leg as failed so the other is cleaned up
+                found.append({'code': getattr(e, 'code', None), 'msg': f"order status unknown ({e})"})
+        missing = [leg for leg, order in zip(legs, found) if order is None]
+        placed = iter(self._place_legs_concurrently(*missing) if missing else ())
+        return [order if order is not None else next(placed) for order in found]
+    
+    def _place_legs_concurrently(self, *legs: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Place OCO legs as individual orders, sent in parallel
+        
+        Returns:
+            Results in leg order; a rejected or failed leg is returned as an error dict
+        """
+        def place(params: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                return self.client.futures_create_order(**params)
+            except BinanceAPIException as e:
+                return {'code': e.code, 'msg': e.message}
+            except Exception as e:
+                # Timeout or dropped connection: report the leg as failed so the
+                # caller still cancels the other leg
+                return {'code': None, 'msg': str(e)}
+        
+        with ThreadPoolExecutor(max_workers=len(legs)) as executor:
+            return list(executor.map(place, legs))
+    
     def monitor_and_cancel_oco(self, symbol: str, tp_order_id: int, sl_order_id: int, 
                                check_interval: int = 5, max_checks: int = 100) -> Optional[str]:
         """
         Monitor OCO orders and cancel the opposite when one fills
         
+        Fills are detected from ORDER_TRADE_UPDATE events on the futures user
+        data stream. Order statuses are checked once over REST at startup to
+        catch fills that happened before the stream connected; if the stream
+        cannot be started, or reports an error, this falls back to REST polling.
+        
         Args:
             symbol: Trading pair symbol
             tp_order_id: Take profit order ID
             sl_order_id: Stop loss order ID
             check_interval: Seconds between checks
             max_checks: Maximum number of checks before stopping
+                        (the stream waits up to max_checks * check_interval seconds)
         
         Returns:
             'TP' if take profit filled, 'SL' if stop loss filled, None if timeout
         """
-        symbol = symbol.upper()
-        checks = 0
+        symbol = canon(symbol)
         
-        self.logger.info(f"Monitoring OCO orders for {symbol}")
+        self.logger.info("Monitoring OCO orders for %s", symbol)
         
         try:
-            while checks < max_checks:
-                # Get order statuses
-                try:
-                    tp_order = self.client.futures_get_order(symbol=symbol, orderId=tp_order_id)
-                    sl_order = self.client.futures_get_order(symbol=symbol, orderId=sl_order_id)
-                    
-                    tp_status = tp_order.get('status')
-                    sl_status = sl_order.get('status')
-                    
-                    # Check if TP filled
-                    if tp_status == 'FILLED':
-                        self.logger.info("Take Profit order filled! Cancelling Stop Loss...")
-                        self.cancel_order(symbol, sl_order_id)
-                        return 'TP'
-                    
-                    # Check if SL filled
-                    if sl_status == 'FILLED':
-                        self.logger.info("Stop Loss order triggered! Cancelling Take Profit...")
-                        self.cancel_order(symbol, tp_order_id)
-                        return 'SL'
-                    
-                    # Check if both are cancelled or expired
-                    if tp_status in ['CANCELED', 'EXPIRED'] and sl_status in ['CANCELED', 'EXPIRED']:
-                        self.logger.warning("Both OCO orders cancelled/expired")
-                        return None
-                    
-                except BinanceAPIException as e:
-                    self.logger.warning(f"Error checking order status: {e.message}")
+            statuses = {tp_order_id: None, sl_order_id: None}
+            updated = threading.Event()
+            stream_failed = threading.Event()
+            
+            def on_user_event(msg: Dict[str, Any]):
+                if msg.get('e') == 'error':
+                    self.logger.warning("User data stream error: %s", msg.get('m'))
+                    stream_failed.set()
+                    updated.set()
+                    return
+                if msg.get('e') != 'ORDER_TRADE_UPDATE':
+                    return
+                order = msg.get('o', {})
+                if order.get('i') in statuses:
+                    statuses[order['i']] = order.get('X')
+                    updated.set()
+            
+            try:
+                self.start_user_stream(on_user_event)
+            except Exception as e:
+                self.logger.warning("User data stream unavailable (%s), falling back to polling", e)
+                return self._poll_oco(symbol, tp_order_id, sl_order_id, check_interval, max_checks)
+            
+            # Reconcile once over REST in case a leg filled before the stream was up
+            try:
+                for order_id in statuses:
+                    order = self.client.futures_get_order(symbol=symbol, orderId=order_id)
+                    if statuses[order_id] is None:
+                        statuses[order_id] = order.get('status')
+            except BinanceAPIException as e:
+                self.logger.warning("Error checking order status: %s", e.message)
+            
+            deadline = time.monotonic() + max_checks * check_interval
+            while True:
+                updated.clear()
+                if stream_failed.is_set():
+                    # Fills would no longer arrive; poll over REST for the rest of the window
+                    self.stop_streams()
+                    remaining_checks = max(1, math.ceil((deadline - time.monotonic()) / check_interval))
+                    self.logger.warning("Falling back to polling for the remaining %s checks", remaining_checks)
+                    return self._poll_oco(symbol, tp_order_id, sl_order_id, check_interval, remaining_checks)
+                
+                finished, result = self._resolve_oco(symbol, tp_order_id, sl_order_id,
+                                                     statuses[tp_order_id], statuses[sl_order_id])
+                if finished:
+                    return result
                 
-                time.sleep(check_interval)
-                checks += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not updated.wait(remaining):
+                    break
             
-            self.logger.warning(f"OCO monitoring timeout after {max_checks} checks")
+            self.logger.warning("OCO monitoring timeout after %ss", max_checks * check_interval)
             return None
             
         except Exception as e:
-            self.logger.error(f"Error monitoring OCO orders: {str(e)}")
+            self.logger.error("Error monitoring OCO orders: %s", e)
             raise
-
+        finally:
+            self.stop_streams()
+    
+    def _resolve_oco(self, symbol: str, tp_order_id: int, sl_order_id: int,
+                     tp_status: Optional[str], sl_status: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Act on the latest OCO leg statuses
+        
+        Returns:
+            Tuple of (finished, result) where result is 'TP', 'SL' or None
+        """
+        # Check if TP filled
+        if tp_status == 'FILLED':
+            self.logger.info("Take Profit order filled! Cancelling Stop Loss...")
+            self.cancel_order(symbol, sl_order_id)
+            return True, 'TP'
+        
+        # Check if SL filled
+        if sl_status == 'FILLED':
+            self.logger.info("Stop Loss order triggered! Cancelling Take Profit...")
+            self.cancel_order(symbol, tp_order_id)
+            return True, 'SL'
+        
+        # Check if both are cancelled or expired
+        if tp_status in ['CANCELED', 'EXPIRED'] and sl_status in ['CANCELED', 'EXPIRED']:
+            self.logger.warning("Both OCO orders cancelled/expired")
+            return True, None
+        
+        return False, None
+    
+    def _poll_oco(self, symbol: str, tp_order_id: int, sl_order_id: int,
+                  check_interval: int, max_checks: int) -> Optional[str]:
+        """Poll OCO leg statuses over REST (used when the user data stream is unavailable or fails)"""
+        checks = 0
+        
+        while checks < max_checks:
+            try:
+                tp_order = self.client.futures_get_order(symbol=symbol, orderId=tp_order_id)
+                sl_order = self.client.futures_get_order(symbol=symbol, orderId=sl_order_id)
+                
+                finished, result = self._resolve_oco(symbol, tp_order_id, sl_order_id,
+                                                     tp_order.get('status'), sl_order.get('status'))
+                if finished:
+                    return result
+                
+            except BinanceAPIException as e:
+                self.logger.warning("Error checking order status: %s", e.message)
+            
+            time.sleep(check_interval)
+            checks += 1
+        
+        self.logger.warning("OCO monitoring timeout after %s checks", max_checks)
+        return None
 
 def main():
     """CLI entry point for OCO orders"""
     Formatter.print_header("BINANCE FUTURES - OCO ORDER (One-Cancels-the-Other)")
     
     # Parse command line arguments
-    if len(sys.argv) < 6:
-        print(f"Usage: python {sys.argv[0]} <SYMBOL> <SIDE> <QUANTITY> <TAKE_PROFIT_PRICE> <STOP_LOSS_PRICE> [POSITION_SIDE] [--monitor]")
-        print(f"\nExample: python {sys.argv[0]} BTCUSDT SELL 0.01 46000 44000")
-        print(f"         (Close LONG position with TP at 46000, SL at 44000)")
-        print(f"\nExample: python {sys.argv[0]} ETHUSDT BUY 0.1 2900 3100 SHORT --monitor")
-        print(f"         (Close SHORT position with TP at 2900, SL at 3100, and monitor)")
-        print(f"\nNote: SIDE should be the closing direction (SELL for LONG, BUY for SHORT)")
-        sys.exit(1)
-    
-    symbol = sys.argv[1]
-    side = sys.argv[2]
-    
-    try:
-        quantity = float(sys.argv[3])
-        take_profit_price = float(sys.argv[4])
-        stop_loss_price = float(sys.argv[5])
-    except ValueError:
-        print(f"{Formatter.format_error(ValueError('Invalid quantity or prices. Must be numbers'))}")
-        sys.exit(1)
-    
-    position_side = 'BOTH'
-    monitor = False
+    parser = argparse.ArgumentParser(
+        description="Place take-profit and stop-loss orders that cancel each other",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            f"Example: python {sys.argv[0]} BTCUSDT SELL 0.01 46000 44000\n"
+            f"         (Close LONG position with TP at 46000, SL at 44000)\n"
+            f"\nExample: python {sys.argv[0]} ETHUSDT BUY 0.1 2900 3100 SHORT --monitor\n"
+            f"         (Close SHORT position with TP at 2900, SL at 3100, and monitor)\n"
+            f"\nNote: SIDE should be the closing direction (SELL for LONG, BUY for SHORT)"
+        )
+    )
+    parser.add_argument('symbol', help="Trading pair symbol (e.g., BTCUSDT)")
+    parser.add_argument('side', help="Closing side (SELL for LONG, BUY for SHORT)")
+    parser.add_argument('quantity', type=float, help="Order quantity (should match position size)")
+    parser.add_argument('take_profit_price', type=float, help="Take profit limit price")
+    parser.add_argument('stop_loss_price', type=float, help="Stop loss trigger price")
+    parser.add_argument('position_side', nargs='?', type=str.upper, default='BOTH',
+                        choices=['BOTH', 'LONG', 'SHORT'], metavar='POSITION_SIDE',
+                        help="Position side: BOTH, LONG or SHORT (default: BOTH)")
+    parser.add_argument('--monitor', action='store_true', help="Monitor and cancel the other order when one fills")
+    args = parser.parse_args()
     
-    for i in range(6, len(sys.argv)):
-        if sys.argv[i].upper() in ['BOTH', 'LONG', 'SHORT']:
-            position_side = sys.argv[i]
-        elif sys.argv[i] == '--monitor':
-            monitor = True
+    symbol = args.symbol
+    side = args.side
+    quantity = args.quantity
+    take_profit_price = args.take_profit_price
+    stop_loss_price = args.stop_loss_price
+    position_side = args.position_side
+    monitor = args.monitor
     
     try:
         # Initialize bot
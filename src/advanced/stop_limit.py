@@ -3,9 +3,10 @@ Stop-Limit Order Implementation for Binance Futures
 Places limit orders that trigger when a stop price is reached
 """
 import sys
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from base_bot import BasicBot
-from utils import BotLogger, Formatter, Validator
+from price_oracle import PriceOracle
+from utils import BotLogger, Formatter, Validator, canon, VALID_TIF
 from binance.exceptions import BinanceAPIException
 
 class StopLimitOrderBot(BasicBot):
@@ -14,6 +15,25 @@ class StopLimitOrderBot(BasicBot):
     def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, testnet: bool = True):
         super().__init__(api_key, api_secret, testnet)
         self.logger = BotLogger('StopLimitOrder')
+        # Constant STOP order fields per (symbol, side, timeInForce, positionSide, reduceOnly)
+        self._stop_templates: Dict[Tuple[str, str, str, str, bool], Dict[str, Any]] = {}
+    
+    def _stop_order_params(self, symbol: str, side: str, quantity: float, stop_price: float,
+                           limit_price: float, time_in_force: str, position_side: str,
+                           reduce_only: bool) -> Dict[str, Any]:
+        """Build STOP order params from a cached template, filling in only the per-order fields"""
+        key = (symbol, side, time_in_force, position_side, reduce_only)
+        template = self._stop_templates.get(key)
+        if template is None:
+            template = self._stop_templates[key] = {
+                'symbol': symbol,
+                'side': side,
+                'type': 'STOP',
+                'timeInForce': time_in_force,
+                'positionSide': position_side,
+                'reduceOnly': reduce_only
+            }
+        return dict(template, quantity=quantity, price=limit_price, stopPrice=stop_price)
     
     def place_stop_limit_order(self, symbol: str, side: str, quantity: float, 
                               stop_price: float, limit_price: float,
@@ -37,6 +57,11 @@ class StopLimitOrderBot(BasicBot):
         Returns:
             Order response dictionary
         """
+        # Normalize once (cached and interned); validate_symbol already requires an uppercase symbol
+        side = canon(side)
+        time_in_force = canon(time_in_force)
+        position_side = canon(position_side)
+        
         # Validate parameters
         if not self.validate_order_params(symbol, side, quantity, limit_price):
             raise ValueError("Invalid order parameters")
@@ -44,30 +69,19 @@ class StopLimitOrderBot(BasicBot):
         if not Validator.validate_price(stop_price):
             raise ValueError(f"Invalid stop price: {stop_price}")
         
-        if not Validator.validate_time_in_force(time_in_force):
+        if time_in_force not in VALID_TIF:
             raise ValueError(f"Invalid time in force: {time_in_force}")
         
-        symbol = symbol.upper()
-        side = side.upper()
-        time_in_force = time_in_force.upper()
-        position_side = position_side.upper()
-        
         try:
             # Log the order attempt
-            self.logger.info(f"Placing STOP_LIMIT {side} order: {quantity} {symbol} | Stop: {stop_price}, Limit: {limit_price}")
+            self.logger.info("Placing STOP_LIMIT %s order: %s %s | Stop: %s, Limit: %s",
+                             side, quantity, symbol, stop_price, limit_price)
             
             # Place stop-limit order
-            order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side,
-                type='STOP',
-                quantity=quantity,
-                price=limit_price,
-                stopPrice=stop_price,
-                timeInForce=time_in_force,
-                positionSide=position_side,
-                reduceOnly=reduce_only
-            )
+            order = self._create_order(**self._stop_order_params(
+                symbol, side, quantity, stop_price, limit_price,
+                time_in_force, position_side, reduce_only
+            ))
             
             # Log successful order
             self.logger.log_order('STOP_LIMIT', {
@@ -81,18 +95,16 @@ class StopLimitOrderBot(BasicBot):
                 'status': order.get('status')
             })
             
-            self.logger.info(f"Stop-limit order placed successfully. Order ID: {order.get('orderId')}")
+            self.logger.info("Stop-limit order placed successfully. Order ID: %s", order.get('orderId'))
             
             return order
             
         except BinanceAPIException as e:
-            error_msg = f"Binance API Error: {e.status_code} - {e.message}"
-            self.logger.error(error_msg)
+            self.logger.error("Binance API Error: %s - %s", e.status_code, e.message)
             self.logger.log_error_trace(e)
             raise
         except Exception as e:
-            error_msg = f"Error placing stop-limit order: {str(e)}"
-            self.logger.error(error_msg)
+            self.logger.error("Error placing stop-limit order: %s", e)
             self.logger.log_error_trace(e)
             raise
 
@@ -127,8 +139,14 @@ def main():
         # Initialize bot
         bot = StopLimitOrderBot(testnet=True)
         
-        # Display current price
-        current_price = bot.get_current_price(symbol)
+        # Display current price (mark price from the stream; REST only if no tick arrives in time)
+        try:
+            PriceOracle.start(bot.testnet)
+        except Exception as e:
+            bot.logger.warning("Price stream unavailable (%s), using ticker instead", e)
+        current_price = PriceOracle.get(symbol, timeout=0.5)
+        if current_price is None:
+            current_price = bot.get_current_price(symbol)
         print(f"Current {symbol} price: {current_price}")
         
         # Validate stop-limit logic
@@ -4,10 +4,13 @@ Splits large orders into smaller chunks executed over time to minimize market im
 """
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from base_bot import BasicBot
-from utils import BotLogger, Formatter
+from config import Config, PRICE_STREAM_MAX_AGE
+from price_oracle import PriceOracle
+from utils import BotLogger, Formatter, canon
 from binance.exceptions import BinanceAPIException
 
 class TWAPBot(BasicBot):
@@ -16,6 +19,7 @@ class TWAPBot(BasicBot):
     def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, testnet: bool = True):
         super().__init__(api_key, api_secret, testnet)
         self.logger = BotLogger('TWAP')
+        self._twap_orders: List[Dict[str, Any]] = []  # child orders placed by the current run
     
     def execute_twap(self, symbol: str, side: str, total_quantity: float,
                     duration_minutes: int, num_orders: int,
@@ -47,118 +51,196 @@ class TWAPBot(BasicBot):
         if duration_minutes < 1:
             raise ValueError("Duration must be at least 1 minute")
         
-        symbol = symbol.upper()
-        side = side.upper()
-        position_side = position_side.upper()
+        symbol = canon(symbol)
+        side = canon(side)
+        position_side = canon(position_side)
         
         # Calculate order parameters
         order_size = total_quantity / num_orders
         interval_seconds = (duration_minutes * 60) / num_orders
         
-        self.logger.info(f"Starting TWAP execution for {symbol}")
-        self.logger.info(f"Total quantity: {total_quantity}, Orders: {num_orders}, Duration: {duration_minutes}min")
-        self.logger.info(f"Order size: {order_size}, Interval: {interval_seconds:.1f}s")
+        self.logger.info("Starting TWAP execution for %s", symbol)
+        self.logger.info("Total quantity: %s, Orders: %s, Duration: %smin", total_quantity, num_orders, duration_minutes)
+        self.logger.info("Order size: %s, Interval: %.1fs", order_size, interval_seconds)
         
         executed_orders = []
+        self._twap_orders = []
         start_time = datetime.now()
+        # Child orders are due at fixed offsets from the start, so API latency
+        # does not push the rest of the schedule back
+        start_monotonic = time.monotonic()
         
+        # Read prices from the shared mark price stream instead of fetching the
+        # ticker for every child order
         try:
-            for i in range(num_orders):
-                order_num = i + 1
-                
-                try:
-                    # Get current price
-                    current_price = self.get_current_price(symbol)
+            PriceOracle.start(self.testnet)
+        except Exception as e:
+            self.logger.warning("Price stream unavailable (%s), polling ticker instead", e)
+        
+        # Children due within Config.TWAP_BATCH_WINDOW of each other are sent
+        # together in one batch request (at the first child's deadline)
+        batch_size = min(Config.BATCH_ORDER_LIMIT, num_orders,
+                         1 + int(Config.TWAP_BATCH_WINDOW // interval_seconds))
+        order_type = 'LIMIT' if use_limit else 'MARKET'
+        # Limit prices are snapped to the symbol's tick size (looked up once)
+        tick_size = self.get_tick_size(symbol) if use_limit else None
+        if use_limit:
+            # Slicing arithmetic that is constant for the whole run, computed once:
+            # BUY rests slightly above the current price, SELL slightly below
+            price_factor = 1 + limit_offset_pct / 100 if side == 'BUY' else 1 - limit_offset_pct / 100
+            ticks_per_unit = 1 / float(tick_size)
+        if batch_size > 1:
+            self.logger.info("Submitting child orders in batches of %s", batch_size)
+        
+        # Every child shares these params (pre-stringified once); limit children
+        # only add their price. The order session caches the signing payload
+        # around the per-order fields (timestamp, client order ID, price).
+        child_params = self._format_batch_order({
+            'symbol': symbol,
+            'side': side,
+            'type': order_type,
+            'quantity': order_size,
+            'positionSide': position_side
+        })
+        
+        try:
+            # Each child is handed to a worker at its deadline, so a slow response
+            # never delays the next child
+            num_groups = -(-num_orders // batch_size)
+            with ThreadPoolExecutor(max_workers=min(Config.MAX_CONCURRENT_REQUESTS, num_groups)) as executor:
+                pending = []
+                group_starts = range(0, num_orders, batch_size)
+                due_times = [start_monotonic + first * interval_seconds for first in group_starts]
+                for first, due in zip(group_starts, due_times):
+                    order_nums = range(first + 1, min(first + batch_size, num_orders) + 1)
                     
-                    # Place order
-                    if use_limit:
-                        # Calculate limit price with offset
-                        if side == 'BUY':
-                            # For buy, place slightly above current price
-                            limit_price = current_price * (1 + limit_offset_pct / 100)
-                        else:
-                            # For sell, place slightly below current price
-                            limit_price = current_price * (1 - limit_offset_pct / 100)
-                        
-                        order = self.client.futures_create_order(
-                            symbol=symbol,
-                            side=side,
-                            type='LIMIT',
-                            quantity=order_size,
-                            price=round(limit_price, 2),
-                            timeInForce='GTC',
-                            positionSide=position_side
-                        )
-                        order_type = 'LIMIT'
-                    else:
-                        order = self.client.futures_create_order(
-                            symbol=symbol,
-                            side=side,
-                            type='MARKET',
-                            quantity=order_size,
-                            positionSide=position_side
-                        )
-                        order_type = 'MARKET'
+                    # Wait until this order is due
+                    wait = due - time.monotonic()
+                    if wait > 0:
+                        self.logger.debug("Waiting %.1fs for next order...", wait)
+                        time.sleep(wait)
                     
-                    executed_orders.append(order)
+                    try:
+                        # Get current price, falling back to REST until the first stream tick
+                        # (or while the stream is stalled)
+                        current_price = PriceOracle.get(symbol, max_age=PRICE_STREAM_MAX_AGE)
+                        if current_price is None:
+                            current_price = self.get_current_price(symbol)
+                    except BinanceAPIException as e:
+                        self.logger.error("Error placing TWAP order %s: %s", order_nums[0], e.message)
+                        # Continue with remaining orders
+                        continue
                     
-                    # Log order
-                    self.logger.info(f"TWAP Order {order_num}/{num_orders} executed: {order_type} {side} {order_size} @ {current_price}")
-                    self.logger.log_order(f'TWAP_{order_type}', {
-                        'orderNumber': order_num,
-                        'symbol': symbol,
-                        'side': side,
-                        'quantity': order_size,
-                        'price': current_price,
-                        'orderId': order.get('orderId')
-                    })
+                    params = child_params
+                    if use_limit:
+                        # Offset limit price, rounded to whole ticks (exact Decimal formatting)
+                        ticks = round(current_price * price_factor * ticks_per_unit)
+                        params = dict(child_params, price=f"{ticks * tick_size:f}", timeInForce='GTC')
                     
-                except BinanceAPIException as e:
-                    error_msg = f"Error placing TWAP order {order_num}: {e.message}"
-                    self.logger.error(error_msg)
-                    # Continue with remaining orders
-                    continue
+                    pending.append(executor.submit(self._submit_twap_children, order_nums, num_orders,
+                                                   params, current_price))
                 
-                # Wait for next interval (except for last order)
-                if i < num_orders - 1:
-                    self.logger.debug(f"Waiting {interval_seconds:.1f}s for next order...")
-                    time.sleep(interval_seconds)
+                for future in pending:
+                    executed_orders.extend(future.result())
             
             # Summary
             end_time = datetime.now()
             elapsed = (end_time - start_time).total_seconds()
             
-            total_executed = sum(float(order.get('executedQty', 0)) for order in executed_orders)
-            avg_price = sum(float(order.get('avgPrice', 0)) * float(order.get('executedQty', 0)) 
-                          for order in executed_orders if order.get('avgPrice')) / total_executed if total_executed > 0 else 0
+            summary = self.get_twap_summary(executed_orders)
             
-            self.logger.info(f"TWAP execution completed")
-            self.logger.info(f"Orders placed: {len(executed_orders)}/{num_orders}")
-            self.logger.info(f"Total executed: {total_executed}/{total_quantity}")
-            self.logger.info(f"Average price: {avg_price:.2f}")
-            self.logger.info(f"Time elapsed: {elapsed:.1f}s")
+            self.logger.info("TWAP execution completed")
+            self.logger.info("Orders placed: %s/%s", len(executed_orders), num_orders)
+            self.logger.info("Total executed: %s/%s", summary.get('total_quantity', 0), total_quantity)
+            self.logger.info("Average price: %.2f", summary.get('average_price', 0))
+            self.logger.info("Time elapsed: %.1fs", elapsed)
             
             return executed_orders
             
         except Exception as e:
-            error_msg = f"Error during TWAP execution: {str(e)}"
-            self.logger.error(error_msg)
+            self.logger.error("Error during TWAP execution: %s", e)
             self.logger.log_error_trace(e)
             raise
     
+    def _submit_twap_children(self, order_nums: range, num_orders: int, params: Dict[str, Any],
+                              current_price: float) -> List[Dict[str, Any]]:
+        """
+        Place one group of identical TWAP child orders and log each result
+        
+        A single child goes over the WebSocket API session; a group is sent as
+        one batch request. Rejected children, and groups whose request fails,
+        are logged and left out.
+        
+        Returns:
+            Successfully placed orders, in order number order
+        """
+        order_type = params['type']
+        try:
+            if len(order_nums) == 1:
+                results = [self._create_order(**params)]
+            else:
+                results = self.place_batch_orders([params] * len(order_nums))
+        except BinanceAPIException as e:
+            self.logger.error("Error placing TWAP order %s: %s", order_nums[0], e.message)
+            return []
+        except Exception as e:
+            # Transport failures (dropped WS session, timeouts, REST errors) only
+            # lose this group; the rest of the schedule still runs
+            self.logger.error("Error placing TWAP order %s: %s", order_nums[0], e)
+            return []
+        
+        placed = []
+        for order_num, order in zip(order_nums, results):
+            if 'code' in order:
+                self.logger.error("Error placing TWAP order %s: %s", order_num, order.get('msg'))
+                continue
+            
+            placed.append(order)
+            self._twap_orders.append(order)
+            
+            # Log order
+            self.logger.info("TWAP Order %s/%s executed: %s %s %s @ %s", order_num, num_orders,
+                             order_type, params['side'], params['quantity'], current_price)
+            self.logger.log_order(f'TWAP_{order_type}', {
+                'orderNumber': order_num,
+                'symbol': params['symbol'],
+                'side': params['side'],
+                'quantity': params['quantity'],
+                'price': current_price,
+                'orderId': order.get('orderId')
+            })
+        return placed
+    
+    def cancel_open_twap_orders(self, symbol: str) -> List[Dict[str, Any]]:
+        """Cancel child orders from the last run that may still be resting on the book"""
+        order_ids = [o['orderId'] for o in self._twap_orders if o.get('status') in ('NEW', 'PARTIALLY_FILLED')]
+        if not order_ids:
+            return []
+        self.logger.info("Cancelling %s open TWAP orders", len(order_ids))
+        return self.cancel_many(symbol, order_ids)
+    
     def get_twap_summary(self, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate summary statistics for TWAP execution"""
         if not orders:
             return {}
         
-        total_qty = sum(float(order.get('executedQty', 0)) for order in orders)
-        total_value = sum(float(order.get('avgPrice', 0)) * float(order.get('executedQty', 0)) 
-                         for order in orders if order.get('avgPrice'))
-        avg_price = total_value / total_qty if total_qty > 0 else 0
+        # Accumulate every aggregate in a single pass over the orders
+        total_qty = 0.0
+        total_value = 0.0
+        min_price = float('inf')
+        max_price = 0.0
+        for order in orders:
+            qty = float(order.get('executedQty', 0))
+            total_qty += qty
+            if order.get('avgPrice'):
+                price = float(order['avgPrice'])
+                total_value += price * qty
+                min_price = price if price < min_price else min_price
+                max_price = price if price > max_price else max_price
         
-        prices = [float(order.get('avgPrice', 0)) for order in orders if order.get('avgPrice')]
-        min_price = min(prices) if prices else 0
-        max_price = max(prices) if prices else 0
+        avg_price = total_value / total_qty if total_qty > 0 else 0
+        if min_price == float('inf'):
+            min_price = 0
         
         return {
             'total_orders': len(orders),
@@ -212,6 +294,7 @@ def main():
                 pass
         i += 1
     
+    bot = None
     try:
         # Initialize bot
         bot = TWAPBot(testnet=True)
@@ -268,10 +351,20 @@ def main():
         
     except KeyboardInterrupt:
         print("\n\nTWAP execution interrupted by user")
+        # Don't leave resting child orders behind
+        if bot is not None:
+            try:
+                bot.cancel_open_twap_orders(symbol)
+            except Exception as e:
+                print(Formatter.format_error(e))
         sys.exit(0)
     except Exception as e:
         print(Formatter.format_error(e))
         sys.exit(1)
+    finally:
+        # The order session outlives execute_twap (the CLI reuses it across runs)
+        if bot is not None:
+            bot.close_order_session()
 
 
 if __name__ == "__main__":
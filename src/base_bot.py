@@ -2,11 +2,48 @@
 Base Bot class for Binance Futures Trading
 Handles API connection and common operations
 """
+import json
+import socket
+import time
+import threading
+import uuid
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 from binance.client import Client
+from binance import ThreadedWebsocketManager
 from binance.exceptions import BinanceAPIException, BinanceRequestException
-from typing import Dict, Any, Optional
-from config import Config
-from utils import BotLogger, Validator
+from typing import Dict, Any, Optional, List, Callable, Tuple
+from config import Config, BATCH_ORDER_WEIGHT, EXCHANGE_INFO_TTL, MIN_PRICE, MIN_QUANTITY, PRICE_CACHE_TTL, PRICE_STREAM_MAX_AGE
+from utils import BotLogger, Validator, RateLimiter, RequestSigner, Ed25519Signer, install_fast_event_loop, use_own_event_loop, canon, json_loads, VALID_SIDES
+from ws_api import WebSocketOrderSession
+from price_oracle import PriceOracle
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets keep Nagle off and send TCP keep-alive probes"""
+    
+    # urllib3's defaults already set TCP_NODELAY; keep-alive probes stop idle
+    # pooled connections from being silently dropped between orders
+    socket_options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        socket_options += [
+            (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30),
+            (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10),
+        ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+# Exchange info shared by all bots in the process, per network (testnet flag):
+# {'ts': fetched_at, 'data': payload, 'by_symbol': {symbol: info}}
+_EXCHANGE_INFO_CACHE: Dict[bool, Dict[str, Any]] = {}
+_EXCHANGE_INFO_LOCK = threading.Lock()
+
+# Plain numeric types accepted by the validate_order_params fast path
+_NUMBER_TYPES = frozenset({int, float})
 
 class BasicBot:
     """Base trading bot class with Binance API integration"""
@@ -24,6 +61,15 @@ class BasicBot:
         self.api_secret = api_secret or Config.API_SECRET
         self.testnet = testnet
         self.logger = BotLogger('BasicBot')
+        self._twm: Optional[ThreadedWebsocketManager] = None
+        self._order_session: Optional[WebSocketOrderSession] = None
+        self._order_session_lock = threading.Lock()
+        self._ws_orders_enabled = True  # cleared if the WebSocket API cannot be reached
+        self._price_cache: Dict[str, Tuple[float, float]] = {}  # symbol -> (price, fetched_at)
+        self._stream_prices: Dict[str, float] = {}  # symbol -> latest bookTicker mid-price
+        self._stream_lock = threading.Lock()
+        self._rate_limiter = RateLimiter(Config.REQUEST_WEIGHT_LIMIT)
+        self._filters_cache: Dict[str, Tuple[Dict[str, Decimal], float]] = {}  # symbol -> (filters, fetched_at)
         
         # Validate credentials
         if not self.api_key or not self.api_secret:
@@ -34,38 +80,144 @@ class BasicBot:
             self.client = Client(self.api_key, self.api_secret, testnet=self.testnet)
             if self.testnet:
                 self.client.API_URL = 'https://testnet.binancefuture.com'
+            self._configure_session()
+            
+            # Sign REST requests with a pre-keyed HMAC instead of re-keying per call
+            # (shared by every bot in the process that uses this secret)
+            self.signer = RequestSigner.for_secret(self.api_secret)
+            self.client._hmac_signature = self.signer.sign
+            # Decode REST responses with orjson when it is installed
+            self.client._handle_response = self._handle_response
             
-            self.logger.info(f"Bot initialized {'(TESTNET)' if testnet else '(MAINNET)'}")
+            # An Ed25519 key lets the WebSocket API session log on once instead of
+            # signing every order; REST keeps using HMAC
+            self.ed25519_signer = Ed25519Signer.from_file(Config.ED25519_KEY_PATH) if Config.ED25519_KEY_PATH else None
+            
+            self.logger.info("Bot initialized %s", '(TESTNET)' if testnet else '(MAINNET)')
         except Exception as e:
-            self.logger.error(f"Failed to initialize bot: {str(e)}")
+            self.logger.error("Failed to initialize bot: %s", e)
             raise
     
-    def get_exchange_info(self) -> Dict[str, Any]:
-        """Get exchange trading rules and symbol information"""
+    @staticmethod
+    def _norm(symbol: str) -> str:
+        """Canonical (uppercase, interned) form of a symbol"""
+        return canon(symbol)
+    
+    @staticmethod
+    def _handle_response(response) -> Any:
+        """Decode a REST response (replaces python-binance's stdlib-json handler)"""
+        if not (200 <= response.status_code < 300):
+            raise BinanceAPIException(response, response.status_code, response.text)
         try:
-            info = self.client.futures_exchange_info()
-            self.logger.debug("Retrieved exchange info")
-            return info
-        except BinanceAPIException as e:
-            self.logger.error(f"API Error getting exchange info: {e}")
-            raise
-        except Exception as e:
-            self.logger.error(f"Error getting exchange info: {e}")
-            raise
+            return json_loads(response.content)
+        except ValueError:
+            raise BinanceRequestException(f"Invalid Response: {response.text}")
+    
+    def _configure_session(self):
+        """Pool kept-alive connections so consecutive and concurrent requests reuse TLS sessions"""
+        adapter = KeepAliveAdapter(pool_connections=4, pool_maxsize=Config.HTTP_POOL_SIZE, pool_block=False)
+        self.client.session.mount('https://', adapter)
+        self.client.session.headers.update({'Connection': 'keep-alive'})
+    
+    def get_exchange_info(self) -> Dict[str, Any]:
+        """Get exchange trading rules and symbol information (cached for Config.EXCHANGE_INFO_TTL seconds)"""
+        with _EXCHANGE_INFO_LOCK:
+            cached = _EXCHANGE_INFO_CACHE.get(self.testnet)
+            if cached and time.monotonic() - cached['ts'] < EXCHANGE_INFO_TTL:
+                return cached['data']
+            
+            try:
+                info = self.client.futures_exchange_info()
+                _EXCHANGE_INFO_CACHE[self.testnet] = {
+                    'ts': time.monotonic(),
+                    'data': info,
+                    'by_symbol': {s['symbol']: s for s in info['symbols']}
+                }
+                self.logger.debug("Retrieved exchange info")
+                return info
+            except BinanceAPIException as e:
+                self.logger.error("API Error getting exchange info: %s", e)
+                raise
+            except Exception as e:
+                self.logger.error("Error getting exchange info: %s", e)
+                raise
     
     def get_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get information for a specific symbol"""
         try:
-            exchange_info = self.get_exchange_info()
-            for s in exchange_info['symbols']:
-                if s['symbol'] == symbol.upper():
-                    return s
-            self.logger.warning(f"Symbol {symbol} not found")
-            return None
+            self.get_exchange_info()
+            info = _EXCHANGE_INFO_CACHE[self.testnet]['by_symbol'].get(self._norm(symbol))
+            if info is None:
+                self.logger.warning("Symbol %s not found", symbol)
+            return info
         except Exception as e:
-            self.logger.error(f"Error getting symbol info: {e}")
+            self.logger.error("Error getting symbol info: %s", e)
             return None
     
+    def get_symbol_filters(self, symbol: str) -> Dict[str, Decimal]:
+        """
+        Get trading filters for a symbol
+        
+        Extracted from exchange info and cached for Config.EXCHANGE_INFO_TTL
+        seconds; missing filters fall back to the Config minimums.
+        
+        Returns:
+            Dict with 'tick_size', 'step_size', 'min_qty' and 'min_notional'
+        """
+        symbol = self._norm(symbol)
+        cached = self._filters_cache.get(symbol)
+        if cached and time.monotonic() - cached[1] < EXCHANGE_INFO_TTL:
+            return cached[0]
+        
+        filters = {
+            'tick_size': Decimal(str(Config.MIN_PRICE)),
+            'step_size': Decimal(str(Config.MIN_QUANTITY)),
+            'min_qty': Decimal(str(Config.MIN_QUANTITY)),
+            'min_notional': Decimal('0'),
+        }
+        symbol_info = self.get_symbol_info(symbol)
+        if not symbol_info:
+            self.logger.warning("No exchange filters for %s, using defaults", symbol)
+            return filters
+        
+        for f in symbol_info.get('filters', []):
+            filter_type = f.get('filterType')
+            if filter_type == 'PRICE_FILTER':
+                filters['tick_size'] = Decimal(f['tickSize']).normalize()
+            elif filter_type == 'LOT_SIZE':
+                filters['step_size'] = Decimal(f['stepSize']).normalize()
+                filters['min_qty'] = Decimal(f['minQty'])
+            elif filter_type == 'MIN_NOTIONAL':
+                filters['min_notional'] = Decimal(f.get('notional', '0'))
+        
+        self._filters_cache[symbol] = (filters, time.monotonic())
+        return filters
+    
+    def get_tick_size(self, symbol: str) -> Decimal:
+        """Price tick size for a symbol from its PRICE_FILTER"""
+        return self.get_symbol_filters(symbol)['tick_size']
+    
+    def validate_against_filters(self, symbol: str, quantity: float, price: Optional[float] = None) -> bool:
+        """Check quantity/price against the symbol's cached exchange filters (no REST call once cached)"""
+        filters = self.get_symbol_filters(symbol)
+        qty = Decimal(str(quantity))
+        
+        if qty < filters['min_qty'] or qty % filters['step_size'] != 0:
+            self.logger.error("Invalid quantity: %s. Must be >= %s in steps of %s",
+                              quantity, filters['min_qty'], filters['step_size'])
+            return False
+        
+        if price is not None:
+            p = Decimal(str(price))
+            if p % filters['tick_size'] != 0:
+                self.logger.error("Invalid price: %s. Must be a multiple of %s", price, filters['tick_size'])
+                return False
+            if p * qty < filters['min_notional']:
+                self.logger.error("Order value %s is below the minimum notional %s", p * qty, filters['min_notional'])
+                return False
+        
+        return True
+    
     def get_account_info(self) -> Dict[str, Any]:
         """Get account information"""
         try:
@@ -73,34 +225,53 @@ class BasicBot:
             self.logger.debug("Retrieved account info")
             return info
         except BinanceAPIException as e:
-            self.logger.error(f"API Error getting account info: {e}")
+            self.logger.error("API Error getting account info: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Error getting account info: {e}")
+            self.logger.error("Error getting account info: %s", e)
             raise
     
-    def get_current_price(self, symbol: str) -> float:
-        """Get current price for a symbol"""
+    def get_current_price(self, symbol: str, use_cache: bool = True) -> float:
+        """
+        Get current (last traded) price for a symbol
+        
+        When the shared PriceOracle is running, its streamed last price
+        (miniTicker) is returned without a REST call. Otherwise ticker prices
+        are reused for Config.PRICE_CACHE_TTL seconds so repeated lookups within
+        one tick share a single REST call. Pass use_cache=False to force a fresh
+        ticker quote.
+        """
         try:
-            # Validate symbol first
+            # Validate symbol first (a valid symbol is already uppercase)
             if not Validator.validate_symbol(symbol):
                 raise ValueError(f"Invalid symbol '{symbol}'. Must be uppercase and end with 'USDT' (e.g., BTCUSDT, ETHUSDT)")
             
-            ticker = self.client.futures_symbol_ticker(symbol=symbol.upper())
+            if use_cache:
+                streamed = PriceOracle.get_last(symbol, max_age=PRICE_STREAM_MAX_AGE)
+                if streamed is not None:
+                    return streamed
+                cached = self._price_cache.get(symbol)
+                if cached and time.monotonic() - cached[1] < PRICE_CACHE_TTL:
+                    return cached[0]
+            
+            ticker = self.client.futures_symbol_ticker(symbol=symbol)
             price = float(ticker['price'])
-            self.logger.debug(f"Current price for {symbol}: {price}")
+            self._price_cache[symbol] = (price, time.monotonic())
+            self.logger.debug("Current price for %s: %s", symbol, price)
             return price
         except BinanceAPIException as e:
+            self._price_cache.pop(symbol, None)
             if e.code == -1121:
-                self.logger.error(f"Invalid symbol '{symbol}'. Use format like BTCUSDT, ETHUSDT, BNBUSDT")
+                self.logger.error("Invalid symbol '%s'. Use format like BTCUSDT, ETHUSDT, BNBUSDT", symbol)
                 raise ValueError(f"Invalid symbol '{symbol}'. Use full symbol name like BTCUSDT, ETHUSDT, etc.")
-            self.logger.error(f"API Error getting price for {symbol}: {e}")
+            self.logger.error("API Error getting price for %s: %s", symbol, e)
             raise
         except ValueError as e:
             self.logger.error(str(e))
             raise
         except Exception as e:
-            self.logger.error(f"Error getting price for {symbol}: {e}")
+            self._price_cache.pop(symbol, None)
+            self.logger.error("Error getting price for %s: %s", symbol, e)
             raise
     
     def set_leverage(self, symbol: str, leverage: int) -> Dict[str, Any]:
@@ -109,74 +280,335 @@ class BasicBot:
             if leverage < 1 or leverage > Config.MAX_LEVERAGE:
                 raise ValueError(f"Leverage must be between 1 and {Config.MAX_LEVERAGE}")
             
-            result = self.client.futures_change_leverage(symbol=symbol.upper(), leverage=leverage)
-            self.logger.info(f"Set leverage to {leverage}x for {symbol}")
+            result = self.client.futures_change_leverage(symbol=self._norm(symbol), leverage=leverage)
+            self.logger.info("Set leverage to %sx for %s", leverage, symbol)
             return result
         except BinanceAPIException as e:
-            self.logger.error(f"API Error setting leverage: {e}")
+            self.logger.error("API Error setting leverage: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Error setting leverage: {e}")
+            self.logger.error("Error setting leverage: %s", e)
             raise
     
     def get_open_orders(self, symbol: Optional[str] = None) -> list:
         """Get all open orders"""
         try:
             if symbol:
-                orders = self.client.futures_get_open_orders(symbol=symbol.upper())
+                orders = self.client.futures_get_open_orders(symbol=self._norm(symbol))
             else:
                 orders = self.client.futures_get_open_orders()
-            self.logger.debug(f"Retrieved {len(orders)} open orders")
+            self.logger.debug("Retrieved %d open orders", len(orders))
             return orders
         except BinanceAPIException as e:
-            self.logger.error(f"API Error getting open orders: {e}")
+            self.logger.error("API Error getting open orders: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Error getting open orders: {e}")
+            self.logger.error("Error getting open orders: %s", e)
             raise
     
     def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
         """Cancel an open order"""
         try:
-            result = self.client.futures_cancel_order(symbol=symbol.upper(), orderId=order_id)
-            self.logger.info(f"Cancelled order {order_id} for {symbol}")
+            result = self.client.futures_cancel_order(symbol=self._norm(symbol), orderId=order_id)
+            self.logger.info("Cancelled order %s for %s", order_id, symbol)
             return result
         except BinanceAPIException as e:
-            self.logger.error(f"API Error cancelling order: {e}")
+            self.logger.error("API Error cancelling order: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Error cancelling order: {e}")
+            self.logger.error("Error cancelling order: %s", e)
             raise
     
     def cancel_all_orders(self, symbol: str) -> Dict[str, Any]:
         """Cancel all open orders for a symbol"""
         try:
-            result = self.client.futures_cancel_all_open_orders(symbol=symbol.upper())
-            self.logger.info(f"Cancelled all orders for {symbol}")
+            result = self.client.futures_cancel_all_open_orders(symbol=self._norm(symbol))
+            self.logger.info("Cancelled all orders for %s", symbol)
             return result
         except BinanceAPIException as e:
-            self.logger.error(f"API Error cancelling all orders: {e}")
+            self.logger.error("API Error cancelling all orders: %s", e)
+            raise
+        except Exception as e:
+            self.logger.error("Error cancelling all orders: %s", e)
             raise
+    
+    def _get_websocket_manager(self) -> ThreadedWebsocketManager:
+        """Lazily start the websocket manager shared by this bot's streams"""
+        if self._twm is None:
+            install_fast_event_loop()
+            twm = ThreadedWebsocketManager(self.api_key, self.api_secret, testnet=self.testnet)
+            use_own_event_loop(twm)
+            twm.daemon = True
+            twm.start()
+            self._twm = twm
+            self.logger.debug("Started websocket manager")
+        return self._twm
+    
+    def start_user_stream(self, callback: Callable[[Dict[str, Any]], None]) -> str:
+        """
+        Subscribe to the futures user data stream
+        
+        The callback receives raw stream events (e.g. ORDER_TRADE_UPDATE) on the
+        websocket thread, so it should only record state and return quickly.
+        
+        Returns:
+            Stream identifier
+        """
+        stream = self._get_websocket_manager().start_futures_user_socket(callback=callback)
+        self.logger.debug("Subscribed to futures user data stream")
+        return stream
+    
+    def start_price_stream(self, symbol: str) -> str:
+        """
+        Subscribe to the futures bookTicker stream for a symbol
+        
+        The latest mid-price is then available from get_stream_price().
+        
+        Returns:
+            Stream identifier
+        """
+        symbol = self._norm(symbol)
+        stream = self._get_websocket_manager().start_futures_multiplex_socket(
+            callback=self._on_book_ticker,
+            streams=[f"{symbol.lower()}@bookTicker"]
+        )
+        self.logger.debug("Subscribed to %s bookTicker stream", symbol)
+        return stream
+    
+    def _on_book_ticker(self, msg: Dict[str, Any]):
+        """Store the bookTicker mid-price (runs on the websocket thread)"""
+        data = msg.get('data', msg)
+        if data.get('e') != 'bookTicker':
+            return
+        mid_price = (float(data['b']) + float(data['a'])) / 2
+        with self._stream_lock:
+            self._stream_prices[data['s']] = mid_price
+    
+    def get_stream_price(self, symbol: str) -> Optional[float]:
+        """Latest streamed mid-price for a symbol, or None before the first tick"""
+        with self._stream_lock:
+            return self._stream_prices.get(self._norm(symbol))
+    
+    def stop_streams(self):
+        """Close all websocket streams opened by this bot"""
+        if self._twm is not None:
+            self._twm.stop()
+            self._twm = None
+            with self._stream_lock:
+                self._stream_prices.clear()
+            self.logger.debug("Stopped websocket manager")
+    
+    def _get_order_session(self) -> WebSocketOrderSession:
+        """Return the WebSocket API order session, connecting it on first use"""
+        with self._order_session_lock:
+            if self._order_session is None:
+                url = Config.WS_API_TESTNET_URL if self.testnet else Config.WS_API_URL
+                if self.ed25519_signer is not None:
+                    self._order_session = WebSocketOrderSession(url, Config.ED25519_API_KEY, self.ed25519_signer, logon=True)
+                else:
+                    self._order_session = WebSocketOrderSession(url, self.api_key, self.signer)
+            if not self._order_session.connected:
+                self._order_session.connect()
+            return self._order_session
+    
+    def _create_order(self, **params) -> Dict[str, Any]:
+        """
+        Place a single order over the WebSocket API session
+        
+        The connection is reused across orders, avoiding a new REST request per
+        order. If the session cannot be connected, this and later orders are
+        sent over REST instead.
+        
+        Every order carries a newClientOrderId. If the response times out or the
+        connection drops after sending, the order may still be live, so it is
+        looked up over REST by that ID before the error is reported.
+        
+        Args:
+            **params: Order parameters (same keys as futures_create_order)
+        
+        Returns:
+            Order response dictionary
+        """
+        if not self._ws_orders_enabled:
+            return self.client.futures_create_order(**params)
+        
+        try:
+            session = self._get_order_session()
         except Exception as e:
-            self.logger.error(f"Error cancelling all orders: {e}")
+            self.logger.warning("WebSocket API unavailable (%s), placing orders over REST", e)
+            self._ws_orders_enabled = False
+            return self.client.futures_create_order(**params)
+        
+        client_order_id = params.setdefault('newClientOrderId', self.new_client_order_id())
+        try:
+            return session.place_order(self._format_batch_order(params))
+        except (FutureTimeoutError, ConnectionError) as e:
+            try:
+                order = self.find_order(params['symbol'], client_order_id)
+            except Exception as lookup_error:
+                self.logger.error("Order %s state unknown after %r; lookup failed: %s",
+                                  client_order_id, e, lookup_error)
+                raise e
+            if order is None:
+                raise
+            self.logger.warning("Order %s was placed despite %r (status %s)",
+                                client_order_id, e, order.get('status'))
+            return order
+    
+    def cancel_many(self, symbol: str, order_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Cancel several orders at once
+        
+        Cancels are pipelined over the WebSocket API session (about one round
+        trip for the lot), or sent as concurrent batch cancel requests of up to
+        Config.BATCH_CANCEL_LIMIT orders over REST if the session is unavailable.
+        
+        Returns:
+            One entry per order ID, in order: the cancel response, or a dict
+            with 'code' and 'msg' for a cancel that failed
+        """
+        symbol = self._norm(symbol)
+        if not order_ids:
+            return []
+        
+        results = None
+        if self._ws_orders_enabled:
+            try:
+                results = self._get_order_session().cancel_orders(symbol, order_ids)
+            except Exception as e:
+                self.logger.warning("WebSocket API unavailable (%s), cancelling over REST", e)
+                self._ws_orders_enabled = False
+        
+        if results is None:
+            limit = Config.BATCH_CANCEL_LIMIT
+            chunks = [order_ids[start:start + limit] for start in range(0, len(order_ids), limit)]
+            
+            def cancel_chunk(chunk):
+                try:
+                    return self.client.futures_cancel_orders(symbol=symbol, orderIdList=json.dumps(chunk))
+                except Exception as e:
+                    return [e] * len(chunk)
+            
+            with ThreadPoolExecutor(max_workers=min(len(chunks), Config.MAX_CONCURRENT_REQUESTS)) as executor:
+                results = [result for chunk_results in executor.map(cancel_chunk, chunks) for result in chunk_results]
+        
+        cancelled = []
+        for order_id, result in zip(order_ids, results):
+            if isinstance(result, Exception):
+                result = {'code': getattr(result, 'code', None), 'msg': getattr(result, 'message', str(result))}
+            if 'code' in result:
+                # Batch cancel reports per-order failures as {'code', 'msg'} entries
+                result = dict(result, orderId=order_id)
+                self.logger.error("Error cancelling order %s: %s", order_id, result['msg'])
+            cancelled.append(result)
+        
+        self.logger.info("Cancelled %s/%s orders for %s", sum('code' not in r for r in cancelled), len(order_ids), symbol)
+        return cancelled
+    
+    def close_order_session(self):
+        """Close the WebSocket API order session if one is open"""
+        with self._order_session_lock:
+            if self._order_session is not None:
+                self._order_session.close()
+                self._order_session = None
+    
+    def place_batch_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place several orders through the futures batchOrders endpoint
+        
+        Orders are sent in chunks of Config.BATCH_ORDER_LIMIT per request, with
+        up to Config.MAX_CONCURRENT_REQUESTS chunks in flight at once. The
+        returned list lines up with ``orders``; an entry containing a ``code``
+        key is the exchange's rejection for that particular order (with
+        ``batchFailed`` and the HTTP ``status`` set when the whole request was
+        rejected).
+        
+        Args:
+            orders: Order parameter dicts (same keys as futures_create_order)
+        
+        Returns:
+            List of order responses / per-order error dicts
+        """
+        limit = Config.BATCH_ORDER_LIMIT
+        chunks = [orders[start:start + limit] for start in range(0, len(orders), limit)]
+        
+        if len(chunks) <= 1:
+            chunk_results = [self._place_batch_chunk(chunk) for chunk in chunks]
+        else:
+            workers = min(len(chunks), Config.MAX_CONCURRENT_REQUESTS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                chunk_results = list(executor.map(self._place_batch_chunk, chunks))
+        
+        return [result for results in chunk_results for result in results]
+    
+    def _place_batch_chunk(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send a single batchOrders request (at most Config.BATCH_ORDER_LIMIT orders)"""
+        try:
+            batch = [self._format_batch_order(order) for order in chunk]
+            self._rate_limiter.acquire(BATCH_ORDER_WEIGHT)
+            results = self.client.futures_place_batch_order(batchOrders=batch)
+            # client.response is the latest response on this client, which is close
+            # enough for weight tracking even with chunks in flight concurrently
+            self._rate_limiter.sync_from_headers(getattr(self.client.response, 'headers', None))
+            return results
+        except BinanceAPIException as e:
+            # The request as a whole was rejected; flag it so callers can retry
+            # the orders individually if they need to
+            self.logger.error("API Error placing batch orders: %s", e)
+            return [{'code': e.code, 'msg': e.message, 'status': e.status_code, 'batchFailed': True} for _ in chunk]
+    
+    @staticmethod
+    def new_client_order_id() -> str:
+        """Unique newClientOrderId, so an order with an unknown outcome can be looked up"""
+        return uuid.uuid4().hex
+    
+    def find_order(self, symbol: str, client_order_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an order by its client order ID
+        
+        Returns:
+            The order (in any status), or None if the exchange has no such order
+        """
+        try:
+            return self.client.futures_get_order(symbol=self._norm(symbol), origClientOrderId=client_order_id)
+        except BinanceAPIException as e:
+            if e.code == -2013:  # Order does not exist
+                return None
             raise
     
+    @staticmethod
+    def _format_batch_order(order: Dict[str, Any]) -> Dict[str, str]:
+        """Stringify order params as the batchOrders JSON payload expects"""
+        formatted = {}
+        for key, value in order.items():
+            if isinstance(value, bool):
+                value = 'true' if value else 'false'
+            formatted[key] = str(value)
+        return formatted
+    
     def validate_order_params(self, symbol: str, side: str, quantity: float, price: Optional[float] = None) -> bool:
         """Validate order parameters"""
+        # Fast path: canonical, numeric inputs (every TWAP/grid child) pass in one check;
+        # anything else falls through to the per-field checks for a precise error
+        if (side in VALID_SIDES and Validator.validate_symbol(symbol)
+                and type(quantity) in _NUMBER_TYPES and quantity >= MIN_QUANTITY
+                and (price is None or (type(price) in _NUMBER_TYPES and price >= MIN_PRICE))):
+            return True
+        
         if not Validator.validate_symbol(symbol):
-            self.logger.error(f"Invalid symbol: {symbol}")
+            self.logger.error("Invalid symbol: %s", symbol)
             return False
         
         if not Validator.validate_side(side):
-            self.logger.error(f"Invalid side: {side}. Must be BUY or SELL")
+            self.logger.error("Invalid side: %s. Must be BUY or SELL", side)
             return False
         
         if not Validator.validate_quantity(quantity):
-            self.logger.error(f"Invalid quantity: {quantity}. Must be >= {Config.MIN_QUANTITY}")
+            self.logger.error("Invalid quantity: %s. Must be >= %s", quantity, Config.MIN_QUANTITY)
             return False
         
         if price is not None and not Validator.validate_price(price):
-            self.logger.error(f"Invalid price: {price}. Must be >= {Config.MIN_PRICE}")
+            self.logger.error("Invalid price: %s. Must be >= %s", price, Config.MIN_PRICE)
             return False
         
         return True
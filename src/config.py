@@ -8,29 +8,100 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Settings are module-level constants so hot paths can import them by name;
+# the Config class below exposes the same values as attributes
+
+# API Credentials
+API_KEY = os.getenv('BINANCE_API_KEY', '')
+API_SECRET = os.getenv('BINANCE_API_SECRET', '')
+
+# Testnet Settings
+USE_TESTNET = os.getenv('USE_TESTNET', 'True').lower() == 'true'
+TESTNET_BASE_URL = os.getenv('TESTNET_BASE_URL', 'https://testnet.binancefuture.com')
+
+# WebSocket API (order entry) Settings
+WS_API_URL = os.getenv('WS_API_URL', 'wss://ws-fapi.binance.com/ws-fapi/v1')
+WS_API_TESTNET_URL = os.getenv('WS_API_TESTNET_URL', 'wss://testnet.binancefuture.com/ws-fapi/v1')
+WS_API_TIMEOUT = 10  # Seconds to wait for a WebSocket API response
+# Optional Ed25519 key pair: when set, the WebSocket API session logs on once
+# and order requests are sent without a per-request signature
+ED25519_API_KEY = os.getenv('BINANCE_ED25519_API_KEY', '')
+ED25519_KEY_PATH = os.getenv('BINANCE_ED25519_KEY_PATH', '')
+
+# Logging Settings
+LOG_FILE = 'bot.log'
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG').upper()  # Raise to INFO in production to skip debug logging entirely
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+LOG_BUFFER_SIZE = 65536  # Bytes of log output buffered before a write() to the file
+LOG_BATCH_SIZE = 256  # Log records joined into a single write
+LOG_FLUSH_INTERVAL = 0.2  # Seconds between flushes of the buffered log file
+
+# Trading Settings
+DEFAULT_LEVERAGE = 1
+MAX_LEVERAGE = 125
+BATCH_ORDER_LIMIT = 5  # Max orders per futures batchOrders request
+BATCH_ORDER_WEIGHT = 5  # Request weight of one batchOrders call
+BATCH_CANCEL_LIMIT = 10  # Max order IDs per batch cancel (DELETE batchOrders) request
+REQUEST_WEIGHT_LIMIT = 1200  # Request weight budget per minute
+MAX_CONCURRENT_REQUESTS = 5  # Max REST requests in flight at once
+HTTP_POOL_SIZE = 16  # Kept-alive connections per host in the REST session
+PRICE_CACHE_TTL = 0.5  # Seconds a fetched ticker price is reused
+PRICE_STREAM_MAX_AGE = 3.0  # Streamed mark prices older than this fall back to REST
+EXCHANGE_INFO_TTL = 3600  # Seconds symbol trading filters are reused
+TWAP_BATCH_WINDOW = 1.0  # TWAP child orders due within this many seconds share one batch request
+GRID_RESYNC_ITERATIONS = 10  # Grid monitor re-reads open orders over REST every N idle checks
+
+# Validation Settings
+MIN_QUANTITY = 0.001
+MIN_PRICE = 0.01
+
+
 class Config:
-    """Configuration class for bot settings"""
+    """Configuration class for bot settings (mirrors the module-level constants)"""
     
     # API Credentials
-    API_KEY = os.getenv('BINANCE_API_KEY', '')
-    API_SECRET = os.getenv('BINANCE_API_SECRET', '')
+    API_KEY = API_KEY
+    API_SECRET = API_SECRET
     
     # Testnet Settings
-    USE_TESTNET = os.getenv('USE_TESTNET', 'True').lower() == 'true'
-    TESTNET_BASE_URL = os.getenv('TESTNET_BASE_URL', 'https://testnet.binancefuture.com')
+    USE_TESTNET = USE_TESTNET
+    TESTNET_BASE_URL = TESTNET_BASE_URL
+    
+    # WebSocket API (order entry) Settings
+    WS_API_URL = WS_API_URL
+    WS_API_TESTNET_URL = WS_API_TESTNET_URL
+    WS_API_TIMEOUT = WS_API_TIMEOUT
+    ED25519_API_KEY = ED25519_API_KEY
+    ED25519_KEY_PATH = ED25519_KEY_PATH
     
     # Logging Settings
-    LOG_FILE = 'bot.log'
-    LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+    LOG_FILE = LOG_FILE
+    LOG_LEVEL = LOG_LEVEL
+    LOG_FORMAT = LOG_FORMAT
+    LOG_DATE_FORMAT = LOG_DATE_FORMAT
+    LOG_BUFFER_SIZE = LOG_BUFFER_SIZE
+    LOG_BATCH_SIZE = LOG_BATCH_SIZE
+    LOG_FLUSH_INTERVAL = LOG_FLUSH_INTERVAL
     
     # Trading Settings
-    DEFAULT_LEVERAGE = 1
-    MAX_LEVERAGE = 125
+    DEFAULT_LEVERAGE = DEFAULT_LEVERAGE
+    MAX_LEVERAGE = MAX_LEVERAGE
+    BATCH_ORDER_LIMIT = BATCH_ORDER_LIMIT
+    BATCH_ORDER_WEIGHT = BATCH_ORDER_WEIGHT
+    BATCH_CANCEL_LIMIT = BATCH_CANCEL_LIMIT
+    REQUEST_WEIGHT_LIMIT = REQUEST_WEIGHT_LIMIT
+    MAX_CONCURRENT_REQUESTS = MAX_CONCURRENT_REQUESTS
+    HTTP_POOL_SIZE = HTTP_POOL_SIZE
+    PRICE_CACHE_TTL = PRICE_CACHE_TTL
+    PRICE_STREAM_MAX_AGE = PRICE_STREAM_MAX_AGE
+    EXCHANGE_INFO_TTL = EXCHANGE_INFO_TTL
+    TWAP_BATCH_WINDOW = TWAP_BATCH_WINDOW
+    GRID_RESYNC_ITERATIONS = GRID_RESYNC_ITERATIONS
     
     # Validation Settings
-    MIN_QUANTITY = 0.001
-    MIN_PRICE = 0.01
+    MIN_QUANTITY = MIN_QUANTITY
+    MIN_PRICE = MIN_PRICE
     
     @classmethod
     def validate(cls):
@@ -2,10 +2,11 @@
 Limit Order Implementation for Binance Futures
 Places orders at specified price levels
 """
+import logging
 import sys
 from typing import Dict, Any, Optional
 from base_bot import BasicBot
-from utils import BotLogger, Formatter, Validator
+from utils import BotLogger, Formatter, canon, VALID_TIF
 from binance.exceptions import BinanceAPIException
 
 class LimitOrderBot(BasicBot):
@@ -37,20 +38,20 @@ class LimitOrderBot(BasicBot):
         if not self.validate_order_params(symbol, side, quantity, price):
             raise ValueError("Invalid order parameters")
         
-        if not Validator.validate_time_in_force(time_in_force):
-            raise ValueError(f"Invalid time in force: {time_in_force}")
+        symbol = canon(symbol)
+        side = canon(side)
+        time_in_force = canon(time_in_force)
+        position_side = canon(position_side)
         
-        symbol = symbol.upper()
-        side = side.upper()
-        time_in_force = time_in_force.upper()
-        position_side = position_side.upper()
+        if time_in_force not in VALID_TIF:
+            raise ValueError(f"Invalid time in force: {time_in_force}")
         
         try:
             # Log the order attempt
-            self.logger.info(f"Placing LIMIT {side} order: {quantity} {symbol} @ {price}")
+            self.logger.info("Placing LIMIT %s order: %s %s @ %s", side, quantity, symbol, price)
             
             # Place limit order
-            order = self.client.futures_create_order(
+            order = self._create_order(
                 symbol=symbol,
                 side=side,
                 type='LIMIT',
@@ -62,28 +63,27 @@ class LimitOrderBot(BasicBot):
             )
             
             # Log successful order
-            self.logger.log_order('LIMIT', {
-                'symbol': symbol,
-                'side': side,
-                'quantity': quantity,
-                'price': price,
-                'timeInForce': time_in_force,
-                'orderId': order.get('orderId'),
-                'status': order.get('status')
-            })
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.log_order('LIMIT', {
+                    'symbol': symbol,
+                    'side': side,
+                    'quantity': quantity,
+                    'price': price,
+                    'timeInForce': time_in_force,
+                    'orderId': order.get('orderId'),
+                    'status': order.get('status')
+                })
             
-            self.logger.info(f"Limit order placed successfully. Order ID: {order.get('orderId')}")
+            self.logger.info("Limit order placed successfully. Order ID: %s", order.get('orderId'))
             
             return order
             
         except BinanceAPIException as e:
-            error_msg = f"Binance API Error: {e.status_code} - {e.message}"
-            self.logger.error(error_msg)
+            self.logger.error("Binance API Error: %s - %s", e.status_code, e.message)
             self.logger.log_error_trace(e)
             raise
         except Exception as e:
-            error_msg = f"Error placing limit order: {str(e)}"
-            self.logger.error(error_msg)
+            self.logger.error("Error placing limit order: %s", e)
             self.logger.log_error_trace(e)
             raise
     
@@ -2,32 +2,19 @@
 Main CLI Interface for Binance Futures Trading Bot
 Provides interactive menu-driven interface for all order types
 """
-import sys
-from colorama import Fore, Style
+import argparse
+import os
+from typing import Dict, Optional, Set
 from config import Config
-from utils import Formatter, BotLogger
+from utils import Formatter, BotLogger, Fore, Style
 from base_bot import BasicBot
+from price_oracle import PriceOracle
 from market_orders import MarketOrderBot
 from limit_orders import LimitOrderBot
 
-# Import advanced order types
-sys.path.append('advanced')
-from advanced.stop_limit import StopLimitOrderBot
-from advanced.oco import OCOOrderBot
-from advanced.twap import TWAPBot
-from advanced.grid_strategy import GridBot
 
-
-class TradingBotCLI:
-    """Main CLI interface for the trading bot"""
-    
-    def __init__(self):
-        self.logger = BotLogger('BotCLI')
-        self.bot = None
-    
-    def print_banner(self):
-        """Print welcome banner"""
-        banner = f"""
+# Banner and menu are built once at import rather than on every loop iteration
+_BANNER = f"""
 {Fore.CYAN}{'='*70}
     ____  _                            ______      __                     
    / __ )(_)___  ____ _____  _______ / ____/_  __/ /___  ___________  ___
@@ -38,11 +25,8 @@ class TradingBotCLI:
             TRADING BOT - USDT-M Futures (TESTNET)
 {'='*70}{Style.RESET_ALL}
 """
-        print(banner)
-    
-    def print_menu(self):
-        """Print main menu"""
-        menu = f"""
+
+_MENU = f"""
 {Fore.YELLOW}MAIN MENU:{Style.RESET_ALL}
 
 {Fore.GREEN}Core Orders:{Style.RESET_ALL}
@@ -64,7 +48,44 @@ class TradingBotCLI:
 
 {Fore.RED}0. Exit{Style.RESET_ALL}
 """
-        print(menu)
+
+
+# Tab-completion candidates for the symbol/side prompts
+_COMPLETIONS = ('BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT', 'BUY', 'SELL')
+
+
+def _enable_line_editing():
+    """Turn on readline history and tab completion for input() where available"""
+    try:
+        import readline
+    except ImportError:  # e.g. Windows without pyreadline
+        return
+    
+    def complete(text, state):
+        matches = [c for c in _COMPLETIONS if c.startswith(text.upper())]
+        return matches[state] if state < len(matches) else None
+    
+    readline.set_completer(complete)
+    readline.parse_and_bind('tab: complete')
+
+
+class TradingBotCLI:
+    """Main CLI interface for the trading bot"""
+    
+    def __init__(self):
+        self.logger = BotLogger('BotCLI')
+        self.bot = None
+        # One bot per order type, created on first use and reused for the whole
+        # session so its HTTP connection and order session stay warm
+        self._bots: Dict[type, BasicBot] = {}
+    
+    def print_banner(self):
+        """Print welcome banner"""
+        print(_BANNER)
+    
+    def print_menu(self):
+        """Print main menu"""
+        print(_MENU)
     
     def initialize_bot(self):
         """Initialize the bot with credentials"""
@@ -72,15 +93,37 @@ class TradingBotCLI:
             Config.validate()
             self.bot = BasicBot(testnet=True)
             self.logger.info("Bot initialized successfully")
-            return True
         except Exception as e:
-            self.logger.error(f"Failed to initialize bot: {str(e)}")
+            self.logger.error("Failed to initialize bot: %s", e)
             print(f"\n{Fore.RED}Error: {str(e)}{Style.RESET_ALL}")
             print(f"\nPlease ensure you have:")
             print(f"1. Created a .env file with your API credentials")
             print(f"2. Set BINANCE_API_KEY and BINANCE_API_SECRET")
             print(f"\nSee .env.example for reference")
             return False
+        
+        # Stream last prices so price lookups in every handler skip REST
+        try:
+            PriceOracle.start(self.bot.testnet)
+        except Exception as e:
+            self.logger.warning("Price stream unavailable (%s), using ticker instead", e)
+        return True
+    
+    def get_bot(self, bot_class: type) -> BasicBot:
+        """Return the session's bot of the given type, creating it on first use"""
+        bot = self._bots.get(bot_class)
+        if bot is None:
+            bot = self._bots[bot_class] = bot_class(testnet=True)
+        return bot
+    
+    def close_bots(self):
+        """Close every bot's order session and streams"""
+        for bot in [self.bot, *self._bots.values()]:
+            if bot is not None:
+                bot.close_order_session()
+                bot.stop_streams()
+        self._bots.clear()
+        PriceOracle.stop()
     
     def get_input(self, prompt: str, type_func=str, default=None):
         """Get user input with type conversion"""
@@ -103,7 +146,7 @@ class TradingBotCLI:
         quantity = self.get_input("Quantity", float)
         
         try:
-            bot = MarketOrderBot(testnet=True)
+            bot = self.get_bot(MarketOrderBot)
             current_price = bot.get_current_price(symbol)
             print(f"\nCurrent {symbol} price: {current_price}")
             
@@ -127,7 +170,7 @@ class TradingBotCLI:
         price = self.get_input("Limit Price", float)
         
         try:
-            bot = LimitOrderBot(testnet=True)
+            bot = self.get_bot(LimitOrderBot)
             current_price = bot.get_current_price(symbol)
             print(f"\nCurrent {symbol} price: {current_price}")
             print(f"Your limit price is {((price - current_price) / current_price * 100):+.2f}% from current")
@@ -152,7 +195,9 @@ class TradingBotCLI:
         limit_price = self.get_input("Limit Price", float)
         
         try:
-            bot = StopLimitOrderBot(testnet=True)
+            # Advanced bots are imported on first use to keep CLI startup light
+            from advanced.stop_limit import StopLimitOrderBot
+            bot = self.get_bot(StopLimitOrderBot)
             current_price = bot.get_current_price(symbol)
             print(f"\nCurrent {symbol} price: {current_price}")
             
@@ -177,7 +222,8 @@ class TradingBotCLI:
         sl_price = self.get_input("Stop Loss Price", float)
         
         try:
-            bot = OCOOrderBot(testnet=True)
+            from advanced.oco import OCOOrderBot
+            bot = self.get_bot(OCOOrderBot)
             current_price = bot.get_current_price(symbol)
             print(f"\nCurrent {symbol} price: {current_price}")
             
@@ -202,7 +248,8 @@ class TradingBotCLI:
         num_orders = self.get_input("Number of Orders", int)
         
         try:
-            bot = TWAPBot(testnet=True)
+            from advanced.twap import TWAPBot
+            bot = self.get_bot(TWAPBot)
             current_price = bot.get_current_price(symbol)
             print(f"\nCurrent {symbol} price: {current_price}")
             
@@ -233,7 +280,8 @@ class TradingBotCLI:
         quantity = self.get_input("Quantity per Grid", float)
         
         try:
-            bot = GridBot(testnet=True)
+            from advanced.grid_strategy import GridBot
+            bot = self.get_bot(GridBot)
             current_price = bot.get_current_price(symbol)
             print(f"\nCurrent {symbol} price: {current_price}")
             
@@ -339,6 +387,14 @@ class TradingBotCLI:
         if not self.initialize_bot():
             return
         
+        _enable_line_editing()
+        try:
+            self._menu_loop()
+        finally:
+            self.close_bots()
+    
+    def _menu_loop(self):
+        """Show the menu and dispatch choices until the user exits"""
         while True:
             self.print_menu()
             
@@ -383,9 +439,44 @@ class TradingBotCLI:
                 input(f"\n{Fore.CYAN}Press Enter to continue...{Style.RESET_ALL}")
 
 
+def _parse_cpus(value: str) -> Set[int]:
+    """Parse a CPU list like '2' or '2,3'"""
+    return {int(cpu) for cpu in value.split(',')}
+
+
+def _tune_process(logger: BotLogger, cpus: Optional[Set[int]], niceness: Optional[int]):
+    """
+    Pin the process to dedicated CPUs and/or change its scheduling priority
+    
+    Keeping order submission on an isolated core (e.g. booted with isolcpus=2)
+    avoids OS scheduler jitter. Both settings are Linux/Unix only; failures
+    (unsupported platform, no permission for a negative nice) are logged and
+    ignored.
+    """
+    if cpus:
+        try:
+            os.sched_setaffinity(0, cpus)
+            logger.info("Pinned to CPU(s) %s", ','.join(map(str, sorted(cpus))))
+        except (AttributeError, OSError) as e:
+            logger.warning("Could not set CPU affinity: %s", e)
+    if niceness:
+        try:
+            os.nice(niceness)
+        except (AttributeError, OSError) as e:
+            logger.warning("Could not change priority: %s", e)
+
+
 def main():
     """Entry point"""
+    parser = argparse.ArgumentParser(description="Interactive Binance Futures trading bot")
+    parser.add_argument('--cpu', type=_parse_cpus, metavar='N[,N...]',
+                        help="Pin the bot to these CPU cores (Linux)")
+    parser.add_argument('--nice', type=int, metavar='N',
+                        help="Adjust process priority, e.g. -5 (negative values need root)")
+    args = parser.parse_args()
+    
     cli = TradingBotCLI()
+    _tune_process(cli.logger, args.cpu, args.nice)
     cli.run()
 
 
@@ -2,10 +2,11 @@
 Market Order Implementation for Binance Futures
 Executes immediate buy/sell orders at current market price
 """
+import logging
 import sys
 from typing import Dict, Any, Optional
 from base_bot import BasicBot
-from utils import BotLogger, Formatter
+from utils import BotLogger, Formatter, canon
 from binance.exceptions import BinanceAPIException
 
 class MarketOrderBot(BasicBot):
@@ -34,16 +35,16 @@ class MarketOrderBot(BasicBot):
         if not self.validate_order_params(symbol, side, quantity):
             raise ValueError("Invalid order parameters")
         
-        symbol = symbol.upper()
-        side = side.upper()
-        position_side = position_side.upper()
+        symbol = canon(symbol)
+        side = canon(side)
+        position_side = canon(position_side)
         
         try:
             # Log the order attempt
-            self.logger.info(f"Placing MARKET {side} order: {quantity} {symbol}")
+            self.logger.info("Placing MARKET %s order: %s %s", side, quantity, symbol)
             
             # Place market order
-            order = self.client.futures_create_order(
+            order = self._create_order(
                 symbol=symbol,
                 side=side,
                 type='MARKET',
@@ -53,26 +54,25 @@ class MarketOrderBot(BasicBot):
             )
             
             # Log successful order
-            self.logger.log_order('MARKET', {
-                'symbol': symbol,
-                'side': side,
-                'quantity': quantity,
-                'orderId': order.get('orderId'),
-                'status': order.get('status')
-            })
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.log_order('MARKET', {
+                    'symbol': symbol,
+                    'side': side,
+                    'quantity': quantity,
+                    'orderId': order.get('orderId'),
+                    'status': order.get('status')
+                })
             
-            self.logger.info(f"Market order placed successfully. Order ID: {order.get('orderId')}")
+            self.logger.info("Market order placed successfully. Order ID: %s", order.get('orderId'))
             
             return order
             
         except BinanceAPIException as e:
-            error_msg = f"Binance API Error: {e.status_code} - {e.message}"
-            self.logger.error(error_msg)
+            self.logger.error("Binance API Error: %s - %s", e.status_code, e.message)
             self.logger.log_error_trace(e)
             raise
         except Exception as e:
-            error_msg = f"Error placing market order: {str(e)}"
-            self.logger.error(error_msg)
+            self.logger.error("Error placing market order: %s", e)
             self.logger.log_error_trace(e)
             raise
     
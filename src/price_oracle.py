@@ -0,0 +1,111 @@
+"""
+Shared price feed for Binance Futures
+One all-symbol markPrice stream and one all-symbol miniTicker (last price)
+stream per process that every bot can read from
+"""
+import threading
+import time
+from typing import Dict, Optional
+from binance import ThreadedWebsocketManager
+from utils import BotLogger, canon, install_fast_event_loop, use_own_event_loop
+
+class PriceOracle:
+    """Process-wide mark prices (!markPrice@arr) and last prices (!miniTicker@arr)"""
+    
+    _prices: Dict[str, float] = {}  # symbol -> latest mark price
+    _last_update = 0.0  # time.monotonic() of the latest mark price message
+    _last_prices: Dict[str, float] = {}  # symbol -> latest traded price
+    _last_prices_update = 0.0  # time.monotonic() of the latest miniTicker message
+    _updated = threading.Condition()
+    _twm: Optional[ThreadedWebsocketManager] = None
+    _logger = BotLogger('PriceOracle')
+    
+    @classmethod
+    def start(cls, testnet: bool = True):
+        """Subscribe to the all-symbol mark and last price streams (no-op if already running)"""
+        with cls._updated:
+            if cls._twm is not None:
+                return
+            install_fast_event_loop()
+            twm = ThreadedWebsocketManager(testnet=testnet)
+            use_own_event_loop(twm)
+            twm.daemon = True
+            twm.start()
+            twm.start_all_mark_price_socket(callback=cls._on_mark_prices)
+            twm.start_futures_multiplex_socket(callback=cls._on_mini_tickers, streams=['!miniTicker@arr'])
+            cls._twm = twm
+        cls._logger.debug("Subscribed to futures mark price and miniTicker streams")
+    
+    @classmethod
+    def stop(cls):
+        """Close the stream and forget all prices"""
+        with cls._updated:
+            twm, cls._twm = cls._twm, None
+            cls._prices.clear()
+            cls._last_prices.clear()
+        if twm is not None:
+            twm.stop()
+    
+    @classmethod
+    def _on_mark_prices(cls, msg):
+        """Store every symbol's mark price from one stream message"""
+        # Combined-stream messages wrap the payload in {'stream', 'data'}
+        updates = msg.get('data') if isinstance(msg, dict) else msg
+        if not isinstance(updates, list):
+            return
+        with cls._updated:
+            for update in updates:
+                cls._prices[update['s']] = float(update['p'])
+            cls._last_update = time.monotonic()
+            cls._updated.notify_all()
+    
+    @classmethod
+    def _on_mini_tickers(cls, msg):
+        """Store the last traded price of every symbol in one miniTicker message"""
+        updates = msg.get('data') if isinstance(msg, dict) else msg
+        if not isinstance(updates, list):
+            return
+        with cls._updated:
+            for update in updates:
+                cls._last_prices[update['s']] = float(update['c'])
+            cls._last_prices_update = time.monotonic()
+    
+    @classmethod
+    def get_last(cls, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        """
+        Latest traded price for a symbol (from the miniTicker stream)
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            max_age: Ignore prices if the stream has been silent this many seconds
+        
+        Returns:
+            Last price, or None if the stream has not delivered one (recently enough)
+        """
+        symbol = canon(symbol)
+        with cls._updated:
+            if max_age is not None and time.monotonic() - cls._last_prices_update > max_age:
+                return None
+            return cls._last_prices.get(symbol)
+    
+    @classmethod
+    def get(cls, symbol: str, timeout: Optional[float] = None,
+            max_age: Optional[float] = None) -> Optional[float]:
+        """
+        Latest mark price for a symbol
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            timeout: Seconds to wait for the first price if none has arrived yet
+            max_age: Ignore prices if the stream has been silent this many seconds
+        
+        Returns:
+            Mark price, or None if the stream has not delivered one (recently enough)
+        """
+        symbol = canon(symbol)
+        with cls._updated:
+            if timeout:
+                cls._updated.wait_for(lambda: symbol in cls._prices, timeout)
+            if max_age is not None and time.monotonic() - cls._last_update > max_age:
+                return None
+            return cls._prices.get(symbol)
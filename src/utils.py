@@ -2,125 +2,499 @@
 Utility functions for the Binance Futures Trading Bot
 Includes logging, validation, and helper functions
 """
+import functools
+import asyncio
+import atexit
+import base64
+import copy
+import hashlib
+import hmac
+import json
 import logging
+import logging.handlers
+import queue
+import re
 import sys
+import threading
+import time
 from datetime import datetime
-from typing import Optional, Dict, Any
-from colorama import init, Fore, Style
-from config import Config
+from typing import Optional, Dict, Any, List
+from config import Config, MIN_QUANTITY, MIN_PRICE
 
-# Initialize colorama for cross-platform colored output
-init(autoreset=True)
+if sys.stdout.isatty():
+    # Initialize colorama for cross-platform colored output
+    from colorama import init, Fore, Style
+    init(autoreset=True)
+else:
+    # Redirected to a file or pipe: skip colorama's stream wrapper and emit no
+    # ANSI codes (every Fore.X / Style.X is an empty string)
+    class _NoColor:
+        def __getattr__(self, name: str) -> str:
+            return ''
+    
+    Fore = Style = _NoColor()
 
-class BotLogger:
-    """Custom logger for the trading bot"""
+# orjson is optional: it decodes/encodes JSON several times faster when installed
+try:
+    import orjson
+    json_loads = orjson.loads
     
-    def __init__(self, name: str = 'BinanceBot'):
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.DEBUG)
-        
-        # File handler
-        file_handler = logging.FileHandler(Config.LOG_FILE)
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+# Log records are queued and written to the file by a single listener thread,
+# so callers never block on file I/O. The console handler stays on the calling
+# thread so status lines keep their place relative to print() and input().
+_LOG_QUEUE: queue.SimpleQueue = queue.SimpleQueue()
+_LOG_LISTENER: Optional[logging.handlers.QueueListener] = None
+_CONSOLE_HANDLER: Optional[logging.Handler] = None
+_LOG_LISTENER_LOCK = threading.Lock()
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler with ping-pong record buffers and a dedicated writer thread
+    
+    emit() only formats the record into the "filling" buffer. A writer thread
+    swaps that buffer for the empty spare once batch_size records accumulate
+    (or every flush_interval seconds) and writes the full one to the file as
+    a single chunk, so the thread that emits never waits on disk I/O.
+    """
+    
+    def __init__(self, filename: str, buffer_size: int = Config.LOG_BUFFER_SIZE,
+                 batch_size: int = Config.LOG_BATCH_SIZE,
+                 flush_interval: float = Config.LOG_FLUSH_INTERVAL, **kwargs):
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._filling: List[str] = []
+        self._spare: List[str] = []  # swapped in under _write_lock
+        self._ready = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._stopped = False
+        super().__init__(filename, **kwargs)
+        self._writer = threading.Thread(target=self._writer_loop, name='log-writer', daemon=True)
+        self._writer.start()
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record: logging.LogRecord):
+        """Format the record into the filling buffer, waking the writer when it is full"""
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._ready:
+            self._filling.append(line)
+            if len(self._filling) >= self.batch_size:
+                self._ready.notify()
+    
+    def _drain(self):
+        """Swap in the spare buffer and write the full one to the file as one chunk"""
+        with self._write_lock:
+            with self._ready:
+                full, self._filling = self._filling, self._spare
+            if not full:
+                self._spare = full
+                return
+            try:
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write('\n'.join(full) + '\n')
+                self.stream.flush()
+            except Exception:
+                self.handleError(None)
+            full.clear()
+            self._spare = full
+    
+    def _writer_loop(self):
+        while True:
+            with self._ready:
+                if len(self._filling) < self.batch_size and not self._stopped:
+                    self._ready.wait(self.flush_interval)
+                stopping = self._stopped
+            self._drain()
+            if stopping:
+                return
+    
+    def flush(self):
+        """Write out whatever is buffered right now"""
+        self._drain()
+    
+    def close(self):
+        with self._ready:
+            self._stopped = True
+            self._ready.notify()
+        self._writer.join(timeout=5)
+        self.flush()
+        super().close()
+
+
+class ColorFormatter(logging.Formatter):
+    """Console formatter that colours each record and prefixes a level symbol"""
+    
+    # Colour + symbol prefix per level, and the reset suffix, built once
+    PREFIXES = {
+        logging.INFO: Fore.GREEN + '✓ ',
+        logging.WARNING: Fore.YELLOW + '⚠ ',
+        logging.ERROR: Fore.RED + '✗ ',
+        logging.CRITICAL: Fore.RED + '✗ ',
+    }
+    RESET = Style.RESET_ALL
+    
+    def format(self, record: logging.LogRecord) -> str:
+        prefix = self.PREFIXES.get(record.levelno)
+        message = super().format(record)
+        return prefix + message + self.RESET if prefix else message
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves the rest of formatting to the listener thread
+    
+    The stock QueueHandler renders the full record (timestamp, traceback) on the
+    calling thread so records can cross process boundaries. The queue here is
+    in-process, so only msg % args is rendered up front, on a copy of the
+    record: args are often dicts the caller goes on to mutate, and the console
+    handler formats the original record. Records without args are enqueued as-is.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders each record's timestamp once per second
+    
+    LOG_DATE_FORMAT has one-second resolution, so every record within the same
+    second shares the localtime()/strftime() result. Only the listener thread
+    formats records, so the cache needs no lock.
+    """
+    
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None):
+        super().__init__(fmt, datefmt)
+        self._cached_sec = -1
+        self._cached_str = ''
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        if second != self._cached_sec:
+            self._cached_str = super().formatTime(record, datefmt)
+            self._cached_sec = second
+        return self._cached_str
+
+
+def _start_log_listener():
+    """Start the shared file-writing listener thread and console handler (once per process)"""
+    global _LOG_LISTENER, _CONSOLE_HANDLER
+    with _LOG_LISTENER_LOCK:
+        if _LOG_LISTENER is not None:
+            return
+        file_handler = BufferedFileHandler(Config.LOG_FILE)
         file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(Config.LOG_FORMAT, Config.LOG_DATE_FORMAT)
+        file_formatter = CachedTimeFormatter(Config.LOG_FORMAT, Config.LOG_DATE_FORMAT)
         file_handler.setFormatter(file_formatter)
         
-        # Console handler
+        # The console handler is deliberately not on the listener. Written from
+        # the listener thread, ✓/✗ status lines interleaved with the CLI's own
+        # print() output and input() prompts. It only sees INFO and above (a few
+        # lines per order), so writing it synchronously costs little; the DEBUG
+        # volume and file I/O stay off the calling thread.
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
-        console_formatter = logging.Formatter('%(levelname)s - %(message)s')
+        console_formatter = ColorFormatter('%(message)s')
         console_handler.setFormatter(console_formatter)
+        _CONSOLE_HANDLER = console_handler
+        
+        _LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, file_handler,
+                                                       respect_handler_level=True)
+        _LOG_LISTENER.start()
+        # Drain queued records before the interpreter exits
+        atexit.register(_LOG_LISTENER.stop)
+
+
+def install_fast_event_loop() -> Optional[str]:
+    """
+    Use a faster asyncio event loop for the websocket stream threads if one is installed
+    
+    python-binance builds each ThreadedWebsocketManager loop through the current
+    event loop policy, so this must run before any manager is created.
+    uringcore (io_uring) is preferred, then uvloop; both are optional.
+    
+    Returns:
+        Name of the loop module in use, or None for the default asyncio loop
+    """
+    for module_name in ('uringcore', 'uvloop'):
+        try:
+            module = __import__(module_name)
+        except ImportError:
+            continue
+        if not isinstance(asyncio.get_event_loop_policy(), module.EventLoopPolicy):
+            asyncio.set_event_loop_policy(module.EventLoopPolicy())
+        return module_name
+    return None
+
+
+def use_own_event_loop(manager) -> None:
+    """
+    Give a python-binance ThreadedWebsocketManager its own asyncio event loop
+    
+    The manager takes asyncio.get_event_loop() at construction, so every
+    manager created on the main thread would share one loop and all but the
+    first would die with "event loop is already running". Call before start().
+    """
+    manager._loop = asyncio.new_event_loop()
+
+
+# USDT-M futures symbol: uppercase letters/digits ending in USDT (5+ characters)
+_SYMBOL_RE = re.compile(r'[A-Z0-9]+USDT')
+
+# Accepted enum values, checked by set membership on every order
+VALID_SIDES = frozenset({'BUY', 'SELL'})
+VALID_ORDER_TYPES = frozenset({'MARKET', 'LIMIT', 'STOP', 'STOP_MARKET', 'TAKE_PROFIT', 'TAKE_PROFIT_MARKET', 'TRAILING_STOP_MARKET'})
+VALID_TIF = frozenset({'GTC', 'IOC', 'FOK', 'GTX'})
+
+
+@functools.lru_cache(maxsize=256)
+def canon(value: str) -> str:
+    """
+    Uppercase and intern an order string (symbol, side, TIF, position side)
+    
+    Orders repeat the same handful of strings, so this is a cache hit almost
+    every time and returns the same interned object for equal inputs.
+    """
+    return sys.intern(value if value.isupper() else value.upper())
+
+
+class BotLogger:
+    """Custom logger for the trading bot"""
+    
+    def __init__(self, name: str = 'BinanceBot'):
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(Config.LOG_LEVEL)
         
-        # Add handlers
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # Loggers are process-wide; only attach handlers the first time a name is used
+        if self.logger.handlers:
+            return
+        
+        # The file handler lives on the shared queue listener, so file records are
+        # only enqueued; console output is written synchronously by a shared handler
+        _start_log_listener()
+        queue_handler = _DeferredQueueHandler(_LOG_QUEUE)
+        queue_handler.setLevel(logging.DEBUG)
+        self.logger.addHandler(queue_handler)
+        self.logger.addHandler(_CONSOLE_HANDLER)
+    
+    def isEnabledFor(self, level: int) -> bool:
+        """Whether a record at this level would be logged (guard costly log arguments)"""
+        return self.logger.isEnabledFor(level)
     
-    def info(self, message: str):
-        """Log info message"""
-        self.logger.info(message)
-        print(f"{Fore.GREEN}✓ {message}{Style.RESET_ALL}")
+    def info(self, message: str, *args):
+        """Log info message (args are %-formatted lazily, as with logging)"""
+        self.logger.info(message, *args)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """Log warning message"""
-        self.logger.warning(message)
-        print(f"{Fore.YELLOW}⚠ {message}{Style.RESET_ALL}")
+        self.logger.warning(message, *args)
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """Log error message"""
-        self.logger.error(message)
-        print(f"{Fore.RED}✗ {message}{Style.RESET_ALL}")
+        self.logger.error(message, *args)
     
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """Log debug message"""
-        self.logger.debug(message)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args)
     
     def log_order(self, order_type: str, details: Dict[str, Any]):
         """Log order details"""
-        log_msg = f"{order_type} Order - {details}"
-        self.logger.info(log_msg)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("%s Order - %r", order_type, details)
     
     def log_api_call(self, endpoint: str, params: Dict[str, Any], response: Any):
-        """Log API call details"""
-        log_msg = f"API Call - Endpoint: {endpoint}, Params: {params}, Response: {response}"
-        self.logger.debug(log_msg)
+        """Log API call details (skipped entirely unless DEBUG is enabled)"""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("API Call - Endpoint: %s, Params: %r, Response: %r", endpoint, params, response)
     
     def log_error_trace(self, error: Exception):
         """Log error with trace"""
-        self.logger.exception(f"Error occurred: {str(error)}")
+        self.logger.exception("Error occurred: %s", error)
 
 
 class Validator:
     """Input validation utilities"""
     
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def validate_symbol(symbol: str) -> bool:
-        """Validate trading symbol format"""
-        if not symbol:
-            return False
-        # Basic validation - should end with USDT for USDT-M futures
-        if not symbol.isupper():
-            return False
-        if len(symbol) < 5:
-            return False
-        # Must end with USDT for USDT-M futures
-        if not symbol.endswith('USDT'):
-            return False
-        return True
+        """Validate trading symbol format (memoized; symbols repeat on every order)"""
+        # Uppercase base asset quoted in USDT (USDT-M futures), e.g. BTCUSDT, 1000PEPEUSDT
+        return bool(symbol) and _SYMBOL_RE.fullmatch(symbol) is not None
     
     @staticmethod
     def validate_side(side: str) -> bool:
         """Validate order side"""
-        return side.upper() in ['BUY', 'SELL']
+        return side in VALID_SIDES or canon(side) in VALID_SIDES
     
     @staticmethod
     def validate_quantity(quantity: float) -> bool:
         """Validate order quantity"""
+        if isinstance(quantity, (int, float)):
+            return quantity >= MIN_QUANTITY
         try:
-            qty = float(quantity)
-            return qty >= Config.MIN_QUANTITY
+            return float(quantity) >= MIN_QUANTITY
         except (ValueError, TypeError):
             return False
     
     @staticmethod
     def validate_price(price: float) -> bool:
         """Validate price"""
+        if isinstance(price, (int, float)):
+            return price >= MIN_PRICE
         try:
-            p = float(price)
-            return p >= Config.MIN_PRICE
+            return float(price) >= MIN_PRICE
         except (ValueError, TypeError):
             return False
     
     @staticmethod
     def validate_order_type(order_type: str) -> bool:
         """Validate order type"""
-        valid_types = ['MARKET', 'LIMIT', 'STOP', 'STOP_MARKET', 'TAKE_PROFIT', 'TAKE_PROFIT_MARKET', 'TRAILING_STOP_MARKET']
-        return order_type.upper() in valid_types
+        return order_type in VALID_ORDER_TYPES or canon(order_type) in VALID_ORDER_TYPES
     
     @staticmethod
     def validate_time_in_force(tif: str) -> bool:
         """Validate time in force"""
-        valid_tif = ['GTC', 'IOC', 'FOK', 'GTX']
-        return tif.upper() in valid_tif
+        return tif in VALID_TIF or canon(tif) in VALID_TIF
+
+
+class RateLimiter:
+    """Token-bucket limiter for Binance request weight"""
+    
+    def __init__(self, capacity: int, window: float = 60.0):
+        """
+        Args:
+            capacity: Request weight allowed per window
+            window: Window length in seconds (Binance uses 1 minute)
+        """
+        self.capacity = capacity
+        self.refill_rate = capacity / window
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+    
+    def acquire(self, weight: int = 1):
+        """Block until the given weight fits in the budget, then consume it"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= weight:
+                    self._tokens -= weight
+                    return
+                wait = (weight - self._tokens) / self.refill_rate
+            time.sleep(wait)
+    
+    def sync_from_headers(self, headers: Optional[Dict[str, str]]):
+        """Lower the budget to match the exchange's X-MBX-USED-WEIGHT-1M header"""
+        used = headers.get('X-MBX-USED-WEIGHT-1M') if headers else None
+        if used is None:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, self.capacity - int(used))
+
+
+class RequestSigner:
+    """HMAC-SHA256 signer for Binance signed requests, keyed once per secret"""
+    
+    def __init__(self, secret: str):
+        # Keying derives the inner/outer pads; copying the keyed object reuses them
+        self._keyed = hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256)
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def for_secret(cls, secret: str) -> 'RequestSigner':
+        """Shared signer for a secret, so every bot using the same key reuses one keyed HMAC"""
+        return cls(secret)
+    
+    def sign(self, query_string: str) -> str:
+        """Return the hex signature for a URL-encoded query string"""
+        mac = self._keyed.copy()
+        mac.update(query_string.encode('utf-8'))
+        return mac.hexdigest()
+
+
+class Ed25519Signer:
+    """Ed25519 signer for Binance WebSocket API session logon"""
+    
+    def __init__(self, key_path: str):
+        """
+        Args:
+            key_path: Path to the PEM-encoded Ed25519 private key
+        """
+        # pycryptodome is already installed as a python-binance dependency
+        from Crypto.PublicKey import ECC
+        from Crypto.Signature import eddsa
+        
+        with open(key_path) as f:
+            self._signer = eddsa.new(ECC.import_key(f.read()), 'rfc8032')
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def from_file(cls, key_path: str) -> 'Ed25519Signer':
+        """Shared signer for a key file, so the PEM is read and parsed once per process"""
+        return cls(key_path)
+    
+    def sign(self, payload: str) -> str:
+        """Return the base64 signature for a payload string"""
+        return base64.b64encode(self._signer.sign(payload.encode('utf-8'))).decode('ascii')
+
+
+# Order response display: (colour-wrapped label prefix, response key) in display
+# order, plus the constant header/separator lines, built once at import
+_ORDER_FIELDS = tuple((f"{label}: {Fore.YELLOW}", key) for label, key in (
+    ('Symbol', 'symbol'),
+    ('Order ID', 'orderId'),
+    ('Client Order ID', 'clientOrderId'),
+    ('Side', 'side'),
+    ('Type', 'type'),
+    ('Position Side', 'positionSide'),
+    ('Quantity', 'origQty'),
+    ('Price', 'price'),
+    ('Stop Price', 'stopPrice'),
+    ('Status', 'status'),
+    ('Time in Force', 'timeInForce'),
+    ('Update Time', 'updateTime'),
+))
+_VALUE_SUFFIX = Style.RESET_ALL + "\n"
+_ORDER_SEPARATOR = "=" * 60 + "\n"
+_ORDER_HEADER = f"{Fore.CYAN}ORDER DETAILS{Style.RESET_ALL}\n"
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_second(second: int) -> str:
+    """Local 'YYYY-MM-DD HH:MM:SS' for an epoch second (orders updated together share it)"""
+    return datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _fmt_ms(ms: int) -> str:
+    """Format a millisecond epoch timestamp (e.g. updateTime) to the second"""
+    return _format_second(int(ms) // 1000)
 
 
 class Formatter:
@@ -132,34 +506,18 @@ class Formatter:
         if not response:
             return "No response data"
         
-        output = "\n" + "="*60 + "\n"
-        output += f"{Fore.CYAN}ORDER DETAILS{Style.RESET_ALL}\n"
-        output += "="*60 + "\n"
-        
-        fields = [
-            ('Symbol', 'symbol'),
-            ('Order ID', 'orderId'),
-            ('Client Order ID', 'clientOrderId'),
-            ('Side', 'side'),
-            ('Type', 'type'),
-            ('Position Side', 'positionSide'),
-            ('Quantity', 'origQty'),
-            ('Price', 'price'),
-            ('Stop Price', 'stopPrice'),
-            ('Status', 'status'),
-            ('Time in Force', 'timeInForce'),
-            ('Update Time', 'updateTime'),
-        ]
-        
-        for label, key in fields:
-            if key in response and response[key]:
-                value = response[key]
+        parts = ['\n', _ORDER_SEPARATOR, _ORDER_HEADER, _ORDER_SEPARATOR]
+        append = parts.append
+        for prefix, key in _ORDER_FIELDS:
+            value = response.get(key)
+            if value:
                 if key == 'updateTime':
-                    value = datetime.fromtimestamp(value/1000).strftime('%Y-%m-%d %H:%M:%S')
-                output += f"{label}: {Fore.YELLOW}{value}{Style.RESET_ALL}\n"
-        
-        output += "="*60 + "\n"
-        return output
+                    value = _fmt_ms(value)
+                append(prefix)
+                append(str(value))
+                append(_VALUE_SUFFIX)
+        append(_ORDER_SEPARATOR)
+        return ''.join(parts)
     
     @staticmethod
     def format_error(error: Exception) -> str:
@@ -175,7 +533,13 @@ class Formatter:
 
 
 def parse_float(value: str, default: float = 0.0) -> float:
-    """Safely parse float from string"""
+    """Safely parse float from string (numbers and None skip the conversion)"""
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
+    if value is None:
+        return default
     try:
         return float(value)
     except (ValueError, TypeError):
@@ -183,13 +547,20 @@ def parse_float(value: str, default: float = 0.0) -> float:
 
 
 def parse_int(value: str, default: int = 0) -> int:
-    """Safely parse int from string"""
+    """Safely parse int from string (ints and None skip the conversion)"""
+    if type(value) is int:
+        return value
+    if value is None:
+        return default
     try:
         return int(value)
     except (ValueError, TypeError):
         return default
 
 
+_time_ns = time.time_ns
+
+
 def get_timestamp() -> int:
     """Get current timestamp in milliseconds"""
-    return int(datetime.now().timestamp() * 1000)
+    return _time_ns() // 1_000_000
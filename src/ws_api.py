@@ -0,0 +1,227 @@
+"""
+WebSocket API session for Binance Futures order entry
+Keeps one connection open and sends signed requests over it instead of REST
+"""
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Dict, Any, List, Tuple, Union
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.client import connect
+from binance.exceptions import BinanceAPIException
+from config import Config
+from utils import BotLogger, RequestSigner, Ed25519Signer, json_loads, json_dumps, get_timestamp
+
+# Per-order values spliced into the cached signing payload rather than keyed on
+_SPLICED_FIELDS = frozenset({'timestamp', 'newClientOrderId', 'price'})
+
+class WebSocketOrderSession:
+    """Persistent, signed connection to the futures WebSocket API"""
+    
+    def __init__(self, url: str, api_key: str, signer: Union[RequestSigner, Ed25519Signer],
+                 timeout: float = Config.WS_API_TIMEOUT, logon: bool = False):
+        """
+        Initialize the session (the connection is opened by connect())
+        
+        Args:
+            url: WebSocket API endpoint
+            api_key: Binance API key matching the signer
+            signer: HMAC signer keyed with the API secret, or an Ed25519 signer
+            timeout: Seconds to wait for each response
+            logon: Authenticate the connection once with session.logon (Ed25519
+                   keys only) instead of signing every request
+        """
+        self.url = url
+        self.api_key = api_key
+        self.signer = signer
+        self.timeout = timeout
+        self.logon = logon
+        self._logged_on = False
+        self.logger = BotLogger('WebSocketAPI')
+        self._ws = None
+        self._pending: Dict[str, Future] = {}  # request id -> response future
+        self._pending_lock = threading.Lock()
+        # Params (minus per-order fields) -> signing payload template; repeated
+        # orders (e.g. TWAP children) skip re-sorting and re-joining
+        self._query_templates: Dict[Tuple, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+    
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+    
+    def connect(self):
+        """Open the connection and start the response reader thread"""
+        self._logged_on = False
+        self._ws = connect(self.url, open_timeout=self.timeout)
+        threading.Thread(target=self._read_loop, args=(self._ws,), daemon=True).start()
+        self.logger.debug("Connected to %s", self.url)
+        
+        if self.logon:
+            try:
+                self.request('session.logon', {})
+            except Exception:
+                self.close()
+                raise
+            self._logged_on = True
+            self.logger.debug("WebSocket API session logged on")
+    
+    def close(self):
+        """Close the connection; pending requests fail with ConnectionError"""
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            ws.close()
+    
+    def _read_loop(self, ws):
+        """Resolve pending requests by id as responses arrive"""
+        try:
+            for message in ws:
+                response = json_loads(message)
+                with self._pending_lock:
+                    future = self._pending.pop(response.get('id'), None)
+                if future is not None:
+                    future.set_result(response)
+        except Exception as e:
+            self.logger.debug("WebSocket reader stopped: %s", e)
+        finally:
+            if self._ws is ws:
+                self._ws = None
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+            for future in pending.values():
+                future.set_exception(ConnectionError("WebSocket API connection closed"))
+    
+    def _send(self, method: str, params: Dict[str, str], signed: bool) -> Tuple[str, Future]:
+        """Send one request frame and return its id and response future"""
+        ws = self._ws
+        if ws is None:
+            raise ConnectionError("WebSocket API session is not connected")
+        
+        if signed and self._logged_on:
+            params = dict(params, timestamp=str(get_timestamp()))
+        elif signed:
+            params = dict(params, apiKey=self.api_key, timestamp=str(get_timestamp()))
+            params['signature'] = self.signer.sign(self._signing_payload(params))
+        
+        request_id = uuid.uuid4().hex
+        future = Future()
+        with self._pending_lock:
+            self._pending[request_id] = future
+        try:
+            ws.send(json_dumps({'id': request_id, 'method': method, 'params': params}))
+        except Exception as e:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            if isinstance(e, ConnectionClosed):
+                # Surface drops as ConnectionError, like responses lost to a closed reader
+                raise ConnectionError(f"WebSocket API connection closed: {e}") from e
+            raise
+        return request_id, future
+    
+    def _signing_payload(self, params: Dict[str, str]) -> str:
+        """
+        Sorted signing payload for params (apiKey and timestamp included)
+        
+        The payload is every param as key=value, sorted by key and joined with
+        '&'. Orders on the same symbol/side/type/quantity differ only in their
+        timestamp, client order ID and (for limit orders) price, so the payload
+        text around those fields is cached and their values are spliced in.
+        """
+        key = tuple((k, v) for k, v in params.items() if k not in _SPLICED_FIELDS)
+        key += tuple(k for k in params if k in _SPLICED_FIELDS)
+        template = self._query_templates.get(key)
+        if template is None:
+            if len(self._query_templates) >= 256:
+                self._query_templates.clear()
+            texts, names = [], []
+            text = ''
+            for i, k in enumerate(sorted(params)):
+                text += f"&{k}=" if i else f"{k}="
+                if k in _SPLICED_FIELDS:
+                    texts.append(text)
+                    names.append(k)
+                    text = ''
+                else:
+                    text += params[k]
+            texts.append(text)
+            template = self._query_templates[key] = (tuple(texts), tuple(names))
+        
+        texts, names = template
+        parts = [texts[0]]
+        for name, text in zip(names, texts[1:]):
+            parts.append(params[name])
+            parts.append(text)
+        return ''.join(parts)
+    
+    def _result(self, request_id: str, future: Future, timeout: float) -> Dict[str, Any]:
+        """Wait for a response and unwrap its result (or raise the exchange error)"""
+        try:
+            response = future.result(timeout=timeout)
+        finally:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+        
+        if response.get('status') != 200:
+            error = response.get('error', {})
+            raise BinanceAPIException(None, response.get('status'), json.dumps(error))
+        return response.get('result', {})
+    
+    def request(self, method: str, params: Dict[str, str], signed: bool = True) -> Dict[str, Any]:
+        """
+        Send a request and wait for its response
+        
+        Args:
+            method: WebSocket API method (e.g. 'order.place')
+            params: Request parameters, already stringified
+            signed: Whether to authenticate the request (just a timestamp once
+                    the session is logged on; apiKey and signature otherwise)
+        
+        Returns:
+            The response 'result' payload
+        
+        Raises:
+            BinanceAPIException: If the exchange rejects the request
+            ConnectionError: If the connection is not open or drops
+        """
+        request_id, future = self._send(method, params, signed)
+        return self._result(request_id, future, self.timeout)
+    
+    def request_many(self, method: str, params_list: List[Dict[str, str]],
+                     signed: bool = True) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Pipeline several requests: send every frame, then collect the responses
+        
+        All requests are in flight at once, so the batch costs about one round
+        trip rather than one per request.
+        
+        Returns:
+            One entry per request, in order: the result payload, or the exception
+            (e.g. BinanceAPIException) for a request that failed
+        """
+        sent = []
+        for params in params_list:
+            try:
+                sent.append(self._send(method, params, signed))
+            except Exception as e:
+                sent.append(e)
+        
+        deadline = time.monotonic() + self.timeout
+        results = []
+        for entry in sent:
+            if isinstance(entry, Exception):
+                results.append(entry)
+                continue
+            try:
+                results.append(self._result(*entry, max(0.0, deadline - time.monotonic())))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def place_order(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """Place an order (same params as futures_create_order, stringified)"""
+        return self.request('order.place', params)
+    
+    def cancel_orders(self, symbol: str, order_ids: List[int]) -> List[Union[Dict[str, Any], Exception]]:
+        """Cancel several orders with pipelined order.cancel requests"""
+        return self.request_many('order.cancel', [{'symbol': symbol, 'orderId': str(order_id)} for order_id in order_ids])